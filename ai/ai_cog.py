@@ -1,6 +1,11 @@
 from __future__ import annotations
-import json
+import os
+import asyncio
+import hashlib
+import time
 import traceback
+from itertools import islice
+import orjson
 import discord
 from discord.ext import commands
 
@@ -10,12 +15,52 @@ from intel.crypto_loader import CryptoClient
 
 # AI pipeline
 from ai.analyst import build_fact_pack
-from ai.client import analyze
+from ai.client import analyze, analyze_batch, ping as ping_ai, aclose as close_ai_client
+
+from cache import SingleFlight, TTLCache
+
+# Identical fact packs within this window reuse the previous model answer.
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", "300"))
+# Shorter horizons go stale faster; unknown horizons use AI_CACHE_TTL.
+AI_CACHE_TTL_BY_HORIZON = {
+    "intraday": float(os.getenv("AI_CACHE_TTL_INTRADAY", "30")),
+    "swing": AI_CACHE_TTL,
+    "position": float(os.getenv("AI_CACHE_TTL_POSITION", "1800")),
+}
+# Fact packs (bundle fetch + indicators) are reused for this long.
+AI_FACTS_TTL = float(os.getenv("AI_FACTS_TTL", "30"))
+# Minimum seconds between progress edits of the "Analyzing…" message (Discord rate limits edits).
+AI_PROGRESS_EVERY = float(os.getenv("AI_PROGRESS_EVERY", "1.5"))
+# Optional comma-separated symbols whose fact packs are kept warm in the background
+# (e.g. "AAPL,MSFT,NVDA,BTC-USD"); empty disables prewarming.
+WATCHLIST = [s.strip().upper() for s in os.getenv("WATCHLIST", "").split(",") if s.strip()]
+PREWARM_INTERVAL = float(os.getenv("PREWARM_INTERVAL", "60"))
+# !multi analyzes at most this many symbols in one model call.
+MULTI_MAX = 6
+
+
+_CRYPTO_SUFFIXES = ("-USD", "USDT")
 
 
 def _is_crypto(sym: str) -> bool:
-    s = sym.upper()
-    return ("-" in s and s.endswith("USD")) or s.endswith("USDT")
+    """`sym` must already be upper-cased (ai_cmd normalizes it once)."""
+    return sym.endswith(_CRYPTO_SUFFIXES)
+
+
+def _action_of(result: dict) -> tuple[int, float, str]:
+    """(rating, confidence, action); fills in the rubric action if the model omitted it."""
+    rating = int(result.get("rating", 3))
+    conf = float(result.get("confidence", 0.5))
+    action = result.get("action")
+    if action not in ("buy", "hold", "sell"):
+        if rating >= 4 and conf >= 0.65:
+            action = "buy"
+        elif rating <= 2 and conf >= 0.65:
+            action = "sell"
+        else:
+            action = "hold"
+        result["action"] = action
+    return rating, conf, action
 
 
 def _fmt_json(d: dict | list | None, limit_list: int | None = None) -> str:
@@ -24,11 +69,42 @@ def _fmt_json(d: dict | list | None, limit_list: int | None = None) -> str:
     if isinstance(d, list) and limit_list is not None:
         d = d[:limit_list]
     try:
-        return json.dumps(d, separators=(",", ":"))
+        return orjson.dumps(d).decode()
     except Exception:
         return str(d)
 
 
+# (embed title, result key) rendered only when the model returned them
+_OPTIONAL_BLOCKS = (
+    ("Bull Signals", "bull"),
+    ("Bear Signals", "bear"),
+    ("Derivs", "derivs"),
+    ("Events", "events"),
+    ("News", "news"),
+    ("Risks", "risk_notes"),
+)
+
+
+_NUM_FMT = {p: f"%.{p}f" for p in range(5)}
+
+
+def _fmt_nums(arr, places: int = 2, max_n: int = 3) -> str:
+    """Pretty-print entries/stops/targets while staying robust."""
+    if not isinstance(arr, list):
+        return "-"
+    nums = [a for a in arr if isinstance(a, (int, float))][:max_n]
+    if not nums:
+        return "-"
+    fmt = _NUM_FMT.get(places) or f"%.{places}f"
+    return ", ".join([fmt % a for a in nums])
+
+
+def _facts_key(facts: dict, horizon: str, risk: str) -> str:
+    """Stable digest of a fact pack + request knobs (facts are already rounded)."""
+    blob = orjson.dumps(facts, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(blob + f"|{horizon}|{risk}".encode(), digest_size=16).hexdigest()
+
+
 class AICog(commands.Cog):
     """AI market analyst: rating, action, entry/exit plan."""
 
@@ -36,16 +112,75 @@ class AICog(commands.Cog):
         self.bot = bot
         self.stock = PolygonClient()
         self.crypto = CryptoClient()
+        self._analysis_cache = TTLCache(maxsize=512, ttl=AI_CACHE_TTL)
+        self._facts_cache = TTLCache(maxsize=256, ttl=AI_FACTS_TTL)
+        self._inflight = SingleFlight()  # identical concurrent requests share one model call
+        self._prewarm_task = self.bot.loop.create_task(self._prewarm()) if WATCHLIST else None
 
     def cog_unload(self):
-        # Close async clients gracefully
-        self.bot.loop.create_task(self.stock.aclose())
-        self.bot.loop.create_task(self.crypto.aclose())
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
+        # Polygon/crypto pools are process-wide (intel.http_clients); only the AI client is ours
+        self.bot.loop.create_task(close_ai_client())
 
     # --- quick sanity command -------------------------------------------------
     @commands.command(name="pingai")
     async def pingai(self, ctx: commands.Context):
-        await ctx.send("AI cog is loaded ✅")
+        # The API probe runs only when asked, never at import/cog load
+        try:
+            model = await ping_ai()
+        except Exception as e:
+            await ctx.send(f"AI cog is loaded ✅ but the OpenAI check failed: {e}")
+            return
+        await ctx.send(f"AI cog is loaded ✅ (OpenAI reachable, model `{model}`)")
+
+    # --- data loading -------------------------------------------------------
+    async def _fetch_bundle(self, sym: str):
+        # stocks include events; crypto doesn't need events_limit
+        if _is_crypto(sym):
+            return await self.crypto.bundle(sym, news_limit=3)
+        return await self.stock.bundle(
+            sym,
+            bars_timespan="day",
+            bars_lookback=240,
+            news_limit=3,
+            events_limit=25,   # ensure earnings/divs are fetched
+        )
+
+    async def _load_facts(self, ctx: commands.Context, sym: str, horizon: str, risk: str) -> dict | None:
+        """Fetch the bundle and build the fact pack; reports errors to the channel."""
+        try:
+            bundle = await self._fetch_bundle(sym)
+        except Exception as e:
+            err = f"Data load failed for {sym}: {e}"
+            await ctx.send(err)
+            return None
+
+        # Build facts for the model
+        try:
+            # pandas/NumPy work runs in a worker thread so the gateway heartbeat keeps ticking
+            return await asyncio.to_thread(build_fact_pack, bundle, horizon=horizon, risk=risk)
+        except Exception as e:
+            await ctx.send(f"Failed to build facts for {sym}: {e}")
+            return None
+
+    async def _prewarm_one(self, sym: str, horizon: str = "swing", risk: str = "medium"):
+        bundle = await self._fetch_bundle(sym)
+        facts = await asyncio.to_thread(build_fact_pack, bundle, horizon=horizon, risk=risk)
+        # keep the entry alive until the next pass refreshes it
+        self._facts_cache.set((sym, horizon, risk), facts, ttl=max(AI_FACTS_TTL, PREWARM_INTERVAL))
+
+    async def _prewarm(self):
+        """Background loop: refresh WATCHLIST fact packs so `!ai` skips the data fetch."""
+        await self.bot.wait_until_ready()
+        while True:
+            results = await asyncio.gather(
+                *(self._prewarm_one(sym) for sym in WATCHLIST), return_exceptions=True
+            )
+            for sym, res in zip(WATCHLIST, results):
+                if isinstance(res, Exception):
+                    print(f"[ai] prewarm failed for {sym}: {res}")
+            await asyncio.sleep(PREWARM_INTERVAL)
 
     # --- main command ---------------------------------------------------------
     @commands.command(name="ai")
@@ -63,36 +198,52 @@ class AICog(commands.Cog):
         """
         sym = symbol.upper().strip()
 
-        # Fetch bundle (stocks include events; crypto doesn't need events_limit)
-        try:
-            if _is_crypto(sym):
-                bundle = await self.crypto.bundle(sym, news_limit=3)
-            else:
-                bundle = await self.stock.bundle(
-                    sym,
-                    bars_timespan="day",
-                    bars_lookback=240,
-                    news_limit=3,
-                    events_limit=25,   # ensure earnings/divs are fetched
-                )
-        except Exception as e:
-            err = f"Data load failed for {sym}: {e}"
-            await ctx.send(err)
-            return
+        facts_key = (sym, horizon, risk)
+        facts = self._facts_cache.get(facts_key)
+        if facts is None:
+            facts = await self._load_facts(ctx, sym, horizon, risk)
+            if facts is None:
+                return
+            self._facts_cache.set(facts_key, facts)
 
-        # Build facts and ask the model
-        try:
-            facts = build_fact_pack(bundle, horizon=horizon, risk=risk)
-        except Exception as e:
-            await ctx.send(f"Failed to build facts for {sym}: {e}")
-            return
+        # On a model call, post a placeholder right away and edit it with the result
+        status: discord.Message | None = None
 
-        try:
-            result = analyze(facts, horizon=horizon, risk=risk)
-        except Exception as e:
-            # Show a short message; log details server-side if you keep logs
-            await ctx.send(f"AI analysis failed: {e}")
-            return
+        async def reply(**kwargs):
+            if status is None:
+                return await ctx.send(**kwargs)
+            kwargs.setdefault("content", None)
+            return await status.edit(**kwargs)
+
+        key = _facts_key(facts, horizon, risk)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            result = dict(cached)
+        else:
+            status = await ctx.send(f"⏳ Analyzing {sym}…")
+            next_edit = time.monotonic() + AI_PROGRESS_EVERY
+
+            async def progress(n_chars: int):
+                # show the model is producing output, throttled to stay under edit limits
+                nonlocal next_edit
+                now = time.monotonic()
+                if now < next_edit:
+                    return
+                next_edit = now + AI_PROGRESS_EVERY
+                try:
+                    await status.edit(content=f"⏳ Analyzing {sym}… ({n_chars} chars received)")
+                except discord.HTTPException:
+                    pass
+
+            try:
+                result = dict(await self._inflight.do(
+                    key, lambda: analyze(facts, horizon=horizon, risk=risk, on_progress=progress)
+                ))
+            except Exception as e:
+                # Show a short message; log details server-side if you keep logs
+                await reply(content=f"AI analysis failed: {e}")
+                return
+            self._analysis_cache.set(key, dict(result), ttl=AI_CACHE_TTL_BY_HORIZON.get(horizon))
 
         # ---- Hardening / fallbacks ------------------------------------------
         # Ensure levels exist (fallback to our computed ones inside facts)
@@ -102,17 +253,7 @@ class AICog(commands.Cog):
             result["levels"] = facts.get("levels", result.get("levels", {}))
 
         # Derive action if model omitted (schema should prevent this, but be safe)
-        rating = int(result.get("rating", 3))
-        conf = float(result.get("confidence", 0.5))
-        action = result.get("action")
-        if action not in ("buy", "hold", "sell"):
-            if rating >= 4 and conf >= 0.65:
-                action = "buy"
-            elif rating <= 2 and conf >= 0.65:
-                action = "sell"
-            else:
-                action = "hold"
-            result["action"] = action
+        rating, conf, action = _action_of(result)
 
         # ---- Build the embed -------------------------------------------------
         desc = result.get("summary", "—")
@@ -131,76 +272,47 @@ class AICog(commands.Cog):
         )
 
         # Core sections
-        embed.add_field(
-            name="Trend",
-            value=_fmt_json(result.get("trend", {})),
-            inline=False,
-        )
-        embed.add_field(
-            name="Levels",
-            value=_fmt_json(result.get("levels", {})),
-            inline=False,
-        )
+        fields: list[tuple[str, str]] = [
+            ("Trend", _fmt_json(result.get("trend", {}))),
+            ("Levels", _fmt_json(result.get("levels", {}))),
+        ]
 
         # Entry / Exit plans
         ep = result.get("entry_plan", {})
         xp = result.get("exit_plan", {})
 
-        # Pretty-print entries/stops/targets while staying robust
-        def _fmt_nums(arr, places=2, max_n=3):
-            if not isinstance(arr, list):
-                return "-"
-            arr = [a for a in arr if isinstance(a, (int, float))][:max_n]
-            if not arr:
-                return "-"
-            return ", ".join(f"{a:.{places}f}" for a in arr)
-
         if ep:
             entries = _fmt_nums(ep.get("entries"), 2, 2)
             ep_notes = ep.get("notes", "")
             ep_method = ep.get("method", "-")
-            embed.add_field(
-                name="Entry Plan",
-                value=f"Method: {ep_method}\nEntries: {entries}\n{ep_notes}".strip(),
-                inline=False,
-            )
+            fields.append(("Entry Plan", f"Method: {ep_method}\nEntries: {entries}\n{ep_notes}".strip()))
 
         if xp:
             stops = _fmt_nums(xp.get("stops"), 2, 2)
             targets = _fmt_nums(xp.get("targets"), 2, 3)
             xp_notes = xp.get("notes", "")
-            embed.add_field(
-                name="Exit Plan",
-                value=f"Stops: {stops}\nTargets: {targets}\n{xp_notes}".strip(),
-                inline=False,
-            )
+            fields.append(("Exit Plan", f"Stops: {stops}\nTargets: {targets}\n{xp_notes}".strip()))
 
         # Optional sections (only if present)
-        optional_blocks = [
-            ("Bull Signals", "signals_bull"),
-            ("Bear Signals", "signals_bear"),
-            ("Derivs", "derivs"),
-            ("Events", "events"),
-            ("News", "news"),
-            ("Risks", "risk_notes"),
-        ]
-        for title, key in optional_blocks:
+        for title, key in _OPTIONAL_BLOCKS:
             val = result.get(key)
             if not val:
                 continue
             if isinstance(val, list):
-                bullets = "• " + "\n• ".join(map(str, val[:4]))
-                embed.add_field(name=title, value=bullets, inline=False)
+                fields.append((title, "• " + "\n• ".join([str(x) for x in islice(val, 4)])))
             else:
-                embed.add_field(name=title, value=_fmt_json(val), inline=False)
+                fields.append((title, _fmt_json(val)))
+
+        for name, value in fields:
+            embed.add_field(name=name, value=value, inline=False)
 
         embed.set_footer(text="Informational only — not investment advice")
 
         # Send it!
         try:
-            await ctx.send(embed=embed)
+            await reply(embed=embed)
         except discord.Forbidden:
-            await ctx.send("I need **Embed Links** permission in this channel to show the analysis.")
+            await reply(content="I need **Embed Links** permission in this channel to show the analysis.")
         except Exception:
             # As a last resort, send plain text if embed failed
             fallback = (
@@ -211,9 +323,54 @@ class AICog(commands.Cog):
                 f"Exit: {result.get('exit_plan')}\n"
                 "Informational only — not investment advice"
             )
-            await ctx.send(fallback)
+            await reply(content=fallback, embed=None)
             traceback.print_exc()
 
+    # --- several symbols, one model call -----------------------------------
+    @commands.command(name="multi")
+    async def multi_cmd(self, ctx: commands.Context, *symbols: str):
+        """
+        Usage: !multi SYM1 SYM2 ... (up to 6, swing/medium)
+        Example: !multi SPY QQQ AAPL
+        """
+        syms = list(dict.fromkeys(s.upper().strip() for s in symbols))[:MULTI_MAX]
+        if not syms:
+            await ctx.send("Usage: `!multi SYM1 SYM2 ...`")
+            return
+        horizon, risk = "swing", "medium"
+
+        async def facts_for(sym: str) -> dict | None:
+            facts = self._facts_cache.get((sym, horizon, risk))
+            if facts is None:
+                facts = await self._load_facts(ctx, sym, horizon, risk)
+                if facts is not None:
+                    self._facts_cache.set((sym, horizon, risk), facts)
+            return facts
+
+        loaded = await asyncio.gather(*(facts_for(s) for s in syms))
+        pairs = [(s, f) for s, f in zip(syms, loaded) if f is not None]
+        if not pairs:
+            return
+
+        status = await ctx.send(f"⏳ Analyzing {', '.join(s for s, _ in pairs)}…")
+        try:
+            results = await analyze_batch([f for _, f in pairs], horizon=horizon, risk=risk)
+        except Exception as e:
+            await status.edit(content=f"AI analysis failed: {e}")
+            return
+
+        embed = discord.Embed(title="Multi-symbol snapshot", color=discord.Color.blurple())
+        for (sym, _), result in zip(pairs, results):
+            rating, conf, action = _action_of(result)
+            summary = str(result.get("summary", "—"))
+            embed.add_field(
+                name=f"{sym} — {action.upper()} | {rating}/5 (conf {conf:.2f})",
+                value=summary[:300] + ("…" if len(summary) > 300 else ""),
+                inline=False,
+            )
+        embed.set_footer(text="Informational only — not investment advice")
+        await status.edit(content=None, embed=embed)
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(AICog(bot))
@@ -1,10 +1,13 @@
 from __future__ import annotations
-from typing import Dict, Any
+import math
+from typing import Dict, Any, NamedTuple, Optional
 from datetime import datetime, timezone
 import numpy as np
 import pandas as pd
 
+from cache import TTLCache
 from charts.adapters import bars_to_df
+from indicators._njit import njit, HAVE_NUMBA
 from indicators.core import (
     sma, ema, rsi, macd, bollinger_bands, atr, vwap, vol_sma
 )
@@ -15,6 +18,20 @@ def _round(x, n=3):
     except Exception:
         return None
 
+def _round_sig(x, sig=3):
+    """Round to `sig` significant digits: same information in fewer prompt tokens."""
+    try:
+        if x is None:
+            return None
+        x = float(x)
+        if not math.isfinite(x):
+            return None
+        if x == 0:
+            return 0.0
+        return float(round(x, sig - int(math.floor(math.log10(abs(x)))) - 1))
+    except Exception:
+        return None
+
 def _pct(a, b):
     try:
         if a is None or b in (None, 0):
@@ -28,6 +45,43 @@ def _as_utc(dt: datetime | None) -> datetime | None:
         return None
     return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
 
+def _next_date(dts, today) -> str | None:
+    """Earliest date >= today among `dts` (ISO string), single pass, no sort."""
+    days = (d.date() for d in map(_as_utc, dts) if d)
+    nxt = min((x for x in days if x >= today), default=None)
+    return nxt.isoformat() if nxt else None
+
+_MAX_BINS = 256
+
+def _score_bins_np(prices, pts, edges, step, weight):
+    """Histogram `prices` over `edges`, then add `weight` at the bin nearest each swing point."""
+    hist, _ = np.histogram(prices, bins=edges)
+    scores = hist.astype(np.float64)
+    pts = pts[np.isfinite(pts)]
+    c0 = (edges[0] + edges[1]) * 0.5
+    idx = np.clip(((pts - c0) / step).round().astype(np.intp), 0, len(scores) - 1)
+    np.add.at(scores, idx, weight)  # unbuffered scatter: repeated bins accumulate
+    return scores
+
+def _score_bins_loop(prices, pts, edges, step, weight):
+    """Same as _score_bins_np as a single native loop (np.histogram bin semantics)."""
+    nb = edges.shape[0] - 1
+    lo, hi = edges[0], edges[nb]
+    scores = np.zeros(nb)
+    for p in prices:
+        if p >= lo and p <= hi:
+            i = np.searchsorted(edges, p, side="right") - 1
+            scores[min(i, nb - 1)] += 1.0
+    c0 = (edges[0] + edges[1]) * 0.5
+    for p in pts:
+        if np.isfinite(p):
+            j = int(np.rint((p - c0) / step))
+            scores[min(max(j, 0), nb - 1)] += weight
+    return scores
+
+# optional: JIT the S/R scoring kernel when numba is installed
+_score_bins = njit(cache=True)(_score_bins_loop) if HAVE_NUMBA else _score_bins_np
+
 def _levels(df: pd.DataFrame, lookback: int = 180, n: int = 3):
     """
     Heuristic S/R:
@@ -51,32 +105,31 @@ def _levels(df: pd.DataFrame, lookback: int = 180, n: int = 3):
         atr14_val = float((tail["h"] - tail["l"]).mean())
     step = max(atr14_val, float(tail["c"].iloc[-1]) * 0.005)  # ~0.5% fallback
 
-    prices = pd.concat([tail["c"], tail["h"], tail["l"]]).values
+    prices = tail[["c", "h", "l"]].to_numpy().ravel()
     if not np.isfinite(step) or step <= 0:
         step = max(float(tail["c"].iloc[-1]) * 0.005, 0.01)
 
-    bins = np.arange(prices.min(), prices.max() + step, step)
-    hist, edges = np.histogram(prices, bins=bins)
-    centers = (edges[:-1] + edges[1:]) / 2
-
-    df_scores = pd.DataFrame({"price": centers, "score": hist.astype(float)})
-
-    def _boost(swings: pd.DataFrame, weight: float):
-        if swings is None or swings.empty:
-            return
-        pts = pd.concat([swings["h"], swings["l"]]).dropna().values
-        idx = np.clip(((pts - centers[0]) / step).round().astype(int), 0, len(centers) - 1)
-        for i in idx:
-            df_scores.loc[i, "score"] += weight
-
-    _boost(swing_highs, 3.0)
-    _boost(swing_lows, 3.0)
+    # ATR-sized bins, capped so a tiny ATR over a wide range can't blow up the histogram
+    lo, hi = float(np.nanmin(prices)), float(np.nanmax(prices))
+    nbins = min(int((hi - lo) / step) + 1, _MAX_BINS)
+    bins = np.linspace(lo, lo + nbins * step if nbins < _MAX_BINS else hi, nbins + 1)
+    step = float(bins[1] - bins[0])
+    centers = (bins[:-1] + bins[1:]) * 0.5
+    swing_pts = np.concatenate((
+        swing_highs[["h", "l"]].to_numpy(np.float64).ravel(),
+        swing_lows[["h", "l"]].to_numpy(np.float64).ravel(),
+    ))
+    scores = _score_bins(prices.astype(np.float64), swing_pts, bins.astype(np.float64), float(step), 3.0)
 
     last = float(tail["c"].iloc[-1])
-    df_scores["dist"] = np.abs(df_scores["price"] - last)
 
-    supports    = df_scores[df_scores["price"] <= last].nlargest(10, "score").sort_values("price")["price"].tolist()
-    resistances = df_scores[df_scores["price"] >= last].nlargest(10, "score").sort_values("price")["price"].tolist()
+    def _top(mask: np.ndarray, k: int = 10) -> list:
+        # stable sort keeps the first-occurrence tie order of DataFrame.nlargest
+        pick = np.argsort(-scores[mask], kind="stable")[:k]
+        return np.sort(centers[mask][pick]).tolist()
+
+    supports    = _top(centers <= last)
+    resistances = _top(centers >= last)
 
     def _dedupe(arr):
         out = []
@@ -92,6 +145,55 @@ def _levels(df: pd.DataFrame, lookback: int = 180, n: int = 3):
     resistances = [float(round(p, 2)) for p in resistances]
     return supports, resistances
 
+class _Indicators(NamedTuple):
+    s20: Optional[float] = None
+    s50: Optional[float] = None
+    s200: Optional[float] = None
+    e21: Optional[float] = None
+    r14: Optional[float] = None
+    macd_line: Optional[float] = None
+    macd_sig: Optional[float] = None
+    macd_hist: Optional[float] = None
+    bbw: Optional[float] = None
+    atr14: Optional[float] = None
+    vwap: Optional[float] = None
+    vol20: Optional[float] = None
+
+# keyed by (symbol, bar count, first/last bar ts, last close/volume): same bars -> same values
+_IND_CACHE = TTLCache(maxsize=256, ttl=600)
+
+def _indicators(sym: str, df: pd.DataFrame) -> _Indicators:
+    if df.empty:
+        return _Indicators()
+    last = df.iloc[-1]
+    key = (sym, len(df), df.index[0].value, df.index[-1].value, float(last["c"]), float(last["v"]))
+    hit = _IND_CACHE.get(key)
+    if hit is not None:
+        return hit
+
+    # Rolling-window indicators only need their last n bars; the EWM/cumulative
+    # ones (EMA, RSI, MACD, ATR, VWAP) depend on the whole history and stay on df.
+    tail20 = df.tail(20)
+    s20 = sma(tail20, 20).iloc[-1]
+    ml, ms, mh = macd(df)
+    bb = bollinger_bands(tail20, 20, 2.0).iloc[-1]
+    ind = _Indicators(
+        s20=s20,
+        s50=sma(df.tail(50), 50).iloc[-1],
+        s200=sma(df.tail(200), 200).iloc[-1],
+        e21=ema(df, 21).iloc[-1],
+        r14=rsi(df, 14).iloc[-1],
+        macd_line=ml.iloc[-1],
+        macd_sig=ms.iloc[-1],
+        macd_hist=mh.iloc[-1],
+        bbw=((bb["upper"] - bb["lower"]) / s20) if s20 else None,
+        atr14=atr(df, 14).iloc[-1],
+        vwap=vwap(df).iloc[-1],
+        vol20=vol_sma(tail20, 20).iloc[-1],
+    )
+    _IND_CACHE.set(key, ind)
+    return ind
+
 def build_fact_pack(bundle, *, horizon="swing", risk="medium") -> Dict[str, Any]:
     """
     Convert IntelBundle -> compact JSON for the model.
@@ -105,21 +207,9 @@ def build_fact_pack(bundle, *, horizon="swing", risk="medium") -> Dict[str, Any]
     prev = bundle.quote.prevClose if bundle.quote else None
     chg = _pct(last, prev)
 
-    # indicators
-    s20 = s50 = s200 = e21 = r14 = macd_line = macd_sig = macd_hist = bbw = atr14_val = vwap_last = vol20 = None
-    if not df.empty:
-        s20 = sma(df, 20).iloc[-1]
-        s50 = sma(df, 50).iloc[-1]
-        s200 = sma(df, 200).iloc[-1]
-        e21  = ema(df, 21).iloc[-1]
-        r14  = rsi(df, 14).iloc[-1]
-        ml, ms, mh = macd(df)
-        macd_line, macd_sig, macd_hist = ml.iloc[-1], ms.iloc[-1], mh.iloc[-1]
-        bb = bollinger_bands(df, 20, 2.0)
-        bbw = ((bb["upper"].iloc[-1] - bb["lower"].iloc[-1]) / s20) if s20 else None
-        atr14_val = atr(df, 14).iloc[-1]
-        vwap_last = vwap(df).iloc[-1]
-        vol20 = vol_sma(df, 20).iloc[-1]
+    # indicators (memoized per symbol + last bar)
+    (s20, s50, s200, e21, r14, macd_line, macd_sig, macd_hist,
+     bbw, atr14_val, vwap_last, vol20) = _indicators(sym, df)
 
     # regime flags
     regime = "side"
@@ -135,27 +225,9 @@ def build_fact_pack(bundle, *, horizon="swing", risk="medium") -> Dict[str, Any]
     news_titles = [n.title for n in (bundle.news or [])][:3]
 
     # events (equity)
-    next_earn = None
-    div_ex = None
     today = datetime.now(timezone.utc).date()
-
-    if getattr(bundle, "earnings", None):
-        fut = []
-        for e in bundle.earnings:
-            d = _as_utc(e.report_date)
-            if d and d.date() >= today:
-                fut.append(d.date())
-        if fut:
-            next_earn = min(fut).isoformat()
-
-    if getattr(bundle, "dividends", None):
-        futd = []
-        for d in bundle.dividends:
-            x = _as_utc(d.ex_dividend_date)
-            if x and x.date() >= today:
-                futd.append(x.date())
-        if futd:
-            div_ex = min(futd).isoformat()
+    next_earn = _next_date((e.report_date for e in getattr(bundle, "earnings", None) or ()), today)
+    div_ex = _next_date((d.ex_dividend_date for d in getattr(bundle, "dividends", None) or ()), today)
 
     # crypto derivatives (optional)
     funding = bundle.funding.rate if getattr(bundle, "funding", None) else None
@@ -171,14 +243,15 @@ def build_fact_pack(bundle, *, horizon="swing", risk="medium") -> Dict[str, Any]
             "dir": regime,
             "rsi": _round(r14, 1),
             "macd": (
-                {"line": _round(macd_line, 3), "sig": _round(macd_sig, 3), "hist": _round(macd_hist, 3)}
+                {"line": _round_sig(macd_line), "sig": _round_sig(macd_sig), "hist": _round_sig(macd_hist)}
                 if macd_line is not None else None
             ),
-            "sma": {"s20": _round(s20, 2), "s50": _round(s50, 2), "s200": _round(s200, 2)},
-            "ema": {"e21": _round(e21, 2)},
-            "vwap": _round(vwap_last, 2),
-            "atr": _round(atr14_val, 2),
-            "bbw": _round(bbw, 3),
+            # price-scale values: 5 significant digits (e.g. 182.35 -> 182.35, 64123.87 -> 64124)
+            "sma": {"s20": _round_sig(s20, 5), "s50": _round_sig(s50, 5), "s200": _round_sig(s200, 5)},
+            "ema": {"e21": _round_sig(e21, 5)},
+            "vwap": _round_sig(vwap_last, 5),
+            "atr": _round_sig(atr14_val, 3),
+            "bbw": _round_sig(bbw),
             "vol20": _round(vol20, 0),
             "s20_gt_s50": bool(s20_gt_s50),
             "px_vs_200": px_vs_200,
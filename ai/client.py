@@ -1,8 +1,11 @@
 from __future__ import annotations
 import os
 import json
-from typing import Dict, Any
-from openai import OpenAI
+import orjson
+from typing import Awaitable, Callable, Dict, Any, Optional
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Model selection
@@ -11,33 +14,80 @@ PRIMARY_MODEL  = os.getenv("AI_MODEL_PRIMARY",  "gpt-5")
 FALLBACK_MODEL = os.getenv("AI_MODEL_FALLBACK", "gpt-4.1")
 
 AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.1"))
-AI_MAX_TOKENS  = int(os.getenv("AI_MAX_TOKENS", "900"))
+AI_MAX_TOKENS  = int(os.getenv("AI_MAX_TOKENS", "600"))  # per symbol; output length bounds latency
 AI_DEBUG       = os.getenv("AI_DEBUG", "0") == "1"
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Shared client (one connection pool per process)
+# ──────────────────────────────────────────────────────────────────────────────
+_CLIENT: Optional[AsyncOpenAI] = None
+
+def _get_client() -> AsyncOpenAI:
+    """Lazily build the module-wide AsyncOpenAI client so keep-alive/TLS is reused."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = AsyncOpenAI(
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,  # concurrent !ai calls multiplex over one connection
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            )
+        )
+    return _CLIENT
+
+async def aclose() -> None:
+    """Close the shared client (called on cog unload)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        client, _CLIENT = _CLIENT, None
+        await client.close()
+
+async def ping() -> str:
+    """On-demand API health check; looks up the primary model (no tokens spent)."""
+    model = await _get_client().models.retrieve(PRIMARY_MODEL)
+    return model.id
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Prompts
 # ──────────────────────────────────────────────────────────────────────────────
 SYSTEM_MSG = (
-    "You are a cautious market commentator. Use ONLY the provided JSON facts. "
-    "Return structured fields for the analysis. "
-    "Do NOT default to 3; pick the most likely direction based on evidence. "
-    "If evidence is balanced, use 3 with LOW confidence and include a brief uncertainty note in risk_notes. "
-    "You MUST include: an action among {buy,hold,sell}, levels (support/resistance), and both entry_plan and exit_plan. "
-    "Entry guidance should be concrete (e.g., breakout above nearest resistance or pullback near support). "
-    "Exit guidance should include numeric stops (e.g., just below support, ~0.5*ATR) and targets (e.g., next resistance). "
-    "Default rubric (unless contradicted by facts): rating>=4 & confidence>=0.65 => buy; "
-    "rating<=2 & confidence>=0.65 => sell; otherwise hold. "
-    "Output must strictly match the schema when provided."
+    "Cautious market commentator. Use ONLY the JSON facts. "
+    "Summary <=120 words; keep lists short. "
+    "Pick the likeliest direction; don't default to rating 3 (if balanced: 3, low confidence, note why in risk_notes). "
+    "Always give action (buy|hold|sell), support/resistance levels, entry_plan (concrete trigger) "
+    "and exit_plan (numeric stops e.g. below support/~0.5*ATR, targets e.g. next resistance). "
+    "Unless facts contradict: rating>=4&conf>=0.65 buy; rating<=2&conf>=0.65 sell; else hold. "
+    "Match the schema exactly."
+)
+
+BATCH_SYSTEM_MSG = SYSTEM_MSG + (
+    " Several symbols may be given as FACTS_1..FACTS_n: return {\"results\": [...]} "
+    "with one analysis object per input, in the same order."
 )
 
+def _prune(obj: Any) -> Any:
+    """Drop None/empty values recursively; they cost tokens and carry no signal."""
+    if isinstance(obj, dict):
+        out = {k: _prune(v) for k, v in obj.items()}
+        return {k: v for k, v in out.items() if v not in (None, {}, [], "")}
+    if isinstance(obj, list):
+        return [v for v in map(_prune, obj) if v not in (None, {}, [], "")]
+    return obj
+
 def _user_message(facts: Dict[str, Any], horizon: str, risk: str) -> str:
     # Keep the message compact and focused.
     return (
         f"HORIZON={horizon}\n"
         f"RISK={risk}\n"
-        f"FACTS={json.dumps(facts, separators=(',',':'))}"
+        f"FACTS={orjson.dumps(_prune(facts)).decode()}"
     )
 
+def _batch_user_message(facts_list: list[Dict[str, Any]], horizon: str, risk: str) -> str:
+    lines = [f"HORIZON={horizon}", f"RISK={risk}", f"N={len(facts_list)}"]
+    for i, facts in enumerate(facts_list, 1):
+        lines.append(f"SYMBOL_{i}={facts.get('symbol')}")
+        lines.append(f"FACTS_{i}={orjson.dumps(_prune(facts)).decode()}")
+    return "\n".join(lines)
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Output schema used for Structured Outputs / Function Calling
 # ──────────────────────────────────────────────────────────────────────────────
@@ -56,8 +106,8 @@ ANALYSIS_SCHEMA: Dict[str, Any] = {
             "properties": {
                 "dir": {"type": "string", "enum": ["up", "down", "side"]},
                 "rsi": {"type": "number"},
-                "sma20_above50": {"type": "boolean"},
-                "price_vs_sma200": {"type": "string", "enum": ["above", "below"]}
+                "s20_50": {"type": "boolean"},                      # sma20 above sma50
+                "vs200": {"type": "string", "enum": ["above", "below"]}    # price vs sma200
             },
             "required": ["dir"],
             "additionalProperties": True
@@ -95,8 +145,8 @@ ANALYSIS_SCHEMA: Dict[str, Any] = {
             "additionalProperties": True
         },
 
-        "signals_bull": {"type": "array", "items": {"type": "string"}},
-        "signals_bear": {"type": "array", "items": {"type": "string"}},
+        "bull": {"type": "array", "items": {"type": "string"}},   # bullish signals
+        "bear": {"type": "array", "items": {"type": "string"}},   # bearish signals
         "derivs": {
             "type": "object",
             "properties": {
@@ -124,6 +174,41 @@ ANALYSIS_SCHEMA: Dict[str, Any] = {
     "additionalProperties": True
 }
 
+# Request payload pieces built once at import and reused by every call
+_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "analysis",
+        "strict": True,
+        "schema": ANALYSIS_SCHEMA
+    }
+}
+_TOOLS = [{
+    "type": "function",
+    "function": {
+        "name": "return_analysis",
+        "description": "Return structured market analysis fields",
+        "parameters": ANALYSIS_SCHEMA,
+    },
+}]
+_TOOL_CHOICE = {"type": "function", "function": {"name": "return_analysis"}}
+_JSON_MODE_FORMAT = {"type": "json_object"}
+_SYSTEM_TURN = {"role": "system", "content": SYSTEM_MSG}
+_BATCH_SYSTEM_TURN = {"role": "system", "content": BATCH_SYSTEM_MSG}
+_BATCH_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "analysis_batch",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"results": {"type": "array", "items": ANALYSIS_SCHEMA}},
+            "required": ["results"],
+            "additionalProperties": False,
+        },
+    },
+}
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Validation helpers
 # ──────────────────────────────────────────────────────────────────────────────
@@ -139,22 +224,27 @@ def _validate_result(res: Dict[str, Any]) -> Dict[str, Any]:
     if missing:
         raise ValueError(f"Missing required fields: {missing}")
 
-    try:
-        rating = int(res["rating"])
-    except Exception as e:
-        raise ValueError(f"Invalid rating value: {e}")
+    # Schema-enforced replies already carry int/float: coerce only when they don't.
+    rating = res["rating"]
+    if type(rating) is not int:
+        try:
+            rating = int(rating)
+        except Exception as e:
+            raise ValueError(f"Invalid rating value: {e}")
     if not (1 <= rating <= 5):
         raise ValueError("Rating must be between 1 and 5")
 
-    try:
-        conf = float(res["confidence"])
-    except Exception as e:
-        raise ValueError(f"Invalid confidence value: {e}")
+    conf = res["confidence"]
+    if type(conf) not in (float, int):
+        try:
+            conf = float(conf)
+        except Exception as e:
+            raise ValueError(f"Invalid confidence value: {e}")
     if not (0.0 <= conf <= 1.0):
         raise ValueError("Confidence must be between 0 and 1")
 
     # Clip noisy arrays to keep Discord output tidy (non-fatal).
-    for k in ("signals_bull", "signals_bear", "news", "risk_notes"):
+    for k in ("bull", "bear", "news", "risk_notes"):
         if isinstance(res.get(k), list) and len(res[k]) > 8:
             res[k] = res[k][:8]
 
@@ -170,55 +260,59 @@ def _debug_log(label: str, payload: Any) -> None:
 # ──────────────────────────────────────────────────────────────────────────────
 # Call strategies
 # ──────────────────────────────────────────────────────────────────────────────
-def _call_structured_outputs(client: OpenAI, model: str, user_msg: str) -> Dict[str, Any]:
+# Optional progress hook: awaited with the number of characters received so far.
+Progress = Optional[Callable[[int], Awaitable[None]]]
+
+async def _call_structured_outputs(
+    client: AsyncOpenAI, model: str, user_msg: str, on_progress: Progress = None,
+    max_tokens: int = AI_MAX_TOKENS,
+) -> Dict[str, Any]:
     """
     Try 'Structured Outputs' (JSON Schema). If the model doesn't support it,
     the API will raise and we'll fall back to other methods.
+    The response is streamed so decoding overlaps with generation.
     """
-    resp = client.chat.completions.create(
+    stream = await client.chat.completions.create(
         model=model,
         temperature=AI_TEMPERATURE,
-        max_tokens=AI_MAX_TOKENS,
-        response_format={
-            "type": "json_schema",
-            "json_schema": {
-                "name": "analysis",
-                "strict": True,
-                "schema": ANALYSIS_SCHEMA
-            }
-        },
+        max_tokens=max_tokens,
+        response_format=_RESPONSE_FORMAT,
         messages=[
-            {"role": "system", "content": SYSTEM_MSG},
+            _SYSTEM_TURN,
             {"role": "user",   "content": user_msg},
         ],
+        stream=True,
     )
-    txt = resp.choices[0].message.content
+    parts = []
+    n = 0
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            delta = chunk.choices[0].delta.content
+            parts.append(delta)
+            n += len(delta)
+            if on_progress:
+                await on_progress(n)
+    txt = "".join(parts)
     _debug_log("StructuredOutputs.raw", txt)
-    return json.loads(txt)
+    return orjson.loads(txt)
 
-def _call_function_calling(client: OpenAI, model: str, user_msg: str) -> Dict[str, Any]:
+async def _call_function_calling(
+    client: AsyncOpenAI, model: str, user_msg: str, on_progress: Progress = None,
+    max_tokens: int = AI_MAX_TOKENS,
+) -> Dict[str, Any]:
     """
     Use function calling to force the shape of the result. We expect exactly one call.
     """
-    tools = [{
-        "type": "function",
-        "function": {
-            "name": "return_analysis",
-            "description": "Return structured market analysis fields",
-            "parameters": ANALYSIS_SCHEMA,
-        },
-    }]
-
-    resp = client.chat.completions.create(
+    resp = await client.chat.completions.create(
         model=model,
         temperature=AI_TEMPERATURE,
-        max_tokens=AI_MAX_TOKENS,
+        max_tokens=max_tokens,
         messages=[
-            {"role": "system", "content": SYSTEM_MSG},
+            _SYSTEM_TURN,
             {"role": "user",   "content": user_msg},
         ],
-        tools=tools,
-        tool_choice={"type": "function", "function": {"name": "return_analysis"}},
+        tools=_TOOLS,
+        tool_choice=_TOOL_CHOICE,
     )
 
     msg = resp.choices[0].message
@@ -228,62 +322,170 @@ def _call_function_calling(client: OpenAI, model: str, user_msg: str) -> Dict[st
 
     args = calls[0].function.arguments
     _debug_log("FunctionCalling.args", args)
-    return json.loads(args)
+    if on_progress:
+        await on_progress(len(args))
+    return orjson.loads(args)
 
-def _call_json_mode(client: OpenAI, model: str, user_msg: str) -> Dict[str, Any]:
+async def _call_json_mode(
+    client: AsyncOpenAI, model: str, user_msg: str, on_progress: Progress = None,
+    max_tokens: int = AI_MAX_TOKENS,
+) -> Dict[str, Any]:
     """
     Final fallback: JSON mode (valid JSON, but shape not enforced).
     """
-    resp = client.chat.completions.create(
+    resp = await client.chat.completions.create(
         model=model,
         temperature=AI_TEMPERATURE,
-        max_tokens=AI_MAX_TOKENS,
-        response_format={"type": "json_object"},
+        max_tokens=max_tokens,
+        response_format=_JSON_MODE_FORMAT,
         messages=[
-            {"role": "system", "content": SYSTEM_MSG},
+            _SYSTEM_TURN,
             {"role": "user",   "content": user_msg},
         ],
     )
     txt = resp.choices[0].message.content
     _debug_log("JsonMode.raw", txt)
-    return json.loads(txt)
+    if on_progress:
+        await on_progress(len(txt or ""))
+    return orjson.loads(txt or "")  # None -> decode error -> next strategy
+
+async def _call_batch(
+    client: AsyncOpenAI, model: str, user_msg: str, n: int, response_format: Dict[str, Any],
+    max_tokens: int,
+) -> list[Dict[str, Any]]:
+    """One completion for n symbols; returns the `results` array."""
+    resp = await client.chat.completions.create(
+        model=model,
+        temperature=AI_TEMPERATURE,
+        max_tokens=max_tokens,
+        response_format=response_format,
+        messages=[
+            _BATCH_SYSTEM_TURN,
+            {"role": "user",   "content": user_msg},
+        ],
+    )
+    txt = resp.choices[0].message.content
+    _debug_log("Batch.raw", txt)
+    data = orjson.loads(txt or "null")
+    res = data.get("results") if isinstance(data, dict) else data
+    if not isinstance(res, list) or len(res) != n:
+        raise ValueError(f"Expected {n} results, got {len(res) if isinstance(res, list) else 0}")
+    return res
+
+# Strategies in preference order. A model whose API rejects one (400) never
+# gets asked for it again: _MODEL_CAPS remembers where to start per model.
+_STRATEGIES = (
+    ("StructuredOutputs", _call_structured_outputs),
+    ("FunctionCalling",   _call_function_calling),
+    ("JsonMode",          _call_json_mode),
+)
+_MODEL_CAPS: Dict[str, int] = {}
+
+# Failures that mean "this model can't do it", as opposed to transient errors
+# (rate limits, timeouts, 5xx) which bubble instead of burning another round trip.
+_MODEL_ERRORS = (openai.BadRequestError, openai.NotFoundError, openai.PermissionDeniedError, ValueError)
+
+# Only a 400 about the request *feature* says something lasting about the model;
+# context length, max_tokens or content-policy 400s are about this one prompt.
+_FEATURE_PARAMS = {"response_format", "tools", "tool_choice"}
+
+
+def _is_unsupported(e: openai.BadRequestError) -> bool:
+    if getattr(e, "param", None) in _FEATURE_PARAMS:
+        return True
+    code = str(getattr(e, "code", None) or "")
+    msg = str(getattr(e, "message", "") or e).lower()
+    return "unsupported" in code or "not supported" in msg or "unsupported" in msg
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Public entry point
 # ──────────────────────────────────────────────────────────────────────────────
-def analyze(facts: Dict[str, Any], *, horizon: str = "swing", risk: str = "medium") -> Dict[str, Any]:
+async def analyze(
+    facts: Dict[str, Any],
+    *,
+    horizon: str = "swing",
+    risk: str = "medium",
+    on_progress: Progress = None,
+    max_tokens: Optional[int] = None,
+) -> Dict[str, Any]:
     """
     Returns a dict with fields:
       symbol, rating(1..5), confidence(0..1), summary, trend, levels,
-      signals_bull, signals_bear, derivs, events, news, risk_notes
+      action, entry_plan, exit_plan, bull, bear, derivs, events, news, risk_notes
     Raises an Exception if parsing/validation fails across all strategies.
+    `on_progress`, if given, is awaited as output arrives (streamed when possible).
+    `max_tokens` overrides AI_MAX_TOKENS for this call.
     """
-    client = OpenAI()
+    client = _get_client()
     user_msg = _user_message(facts, horizon, risk)
 
-    def try_all(model_name: str) -> Dict[str, Any]:
-        # 1) Structured Outputs (strict JSON Schema)
-        try:
-            res = _call_structured_outputs(client, model_name, user_msg)
-            return _validate_result(res)
-        except Exception as e:
-            _debug_log(f"{model_name}.StructuredOutputs.error", str(e))
+    async def try_all(model_name: str) -> Dict[str, Any]:
+        start = _MODEL_CAPS.get(model_name, 0)
+        last = len(_STRATEGIES) - 1
+        for i in range(start, last + 1):
+            label, call = _STRATEGIES[i]
+            try:
+                return _validate_result(await call(
+                    client, model_name, user_msg, on_progress, max_tokens=max_tokens or AI_MAX_TOKENS
+                ))
+            except openai.BadRequestError as e:
+                if i == last:
+                    _debug_log(f"{model_name}.{label}.error", str(e))
+                    raise
+                if _is_unsupported(e):
+                    # unsupported response_format/tools: skip this strategy from now on
+                    _debug_log(f"{model_name}.{label}.unsupported", str(e))
+                    _MODEL_CAPS[model_name] = i + 1
+                else:
+                    # a 400 about this prompt: next strategy this time only
+                    _debug_log(f"{model_name}.{label}.error", str(e))
+            except ValueError as e:
+                # bad JSON / shape from the model: try the next strategy this time only
+                _debug_log(f"{model_name}.{label}.error", str(e))
+                if i == last:
+                    raise
 
-        # 2) Function Calling
-        try:
-            res = _call_function_calling(client, model_name, user_msg)
-            return _validate_result(res)
-        except Exception as e:
-            _debug_log(f"{model_name}.FunctionCalling.error", str(e))
+    # Try PRIMARY, then FALLBACK
+    try:
+        return await try_all(PRIMARY_MODEL)
+    except _MODEL_ERRORS as e1:
+        _debug_log("PRIMARY.failure", str(e1))
 
-        # 3) JSON Mode (valid JSON, no enforced shape)
-        res = _call_json_mode(client, model_name, user_msg)
-        return _validate_result(res)
+    return await try_all(FALLBACK_MODEL)
+
+async def analyze_batch(
+    facts_list: list[Dict[str, Any]], *, horizon: str = "swing", risk: str = "medium",
+    max_tokens: Optional[int] = None,
+) -> list[Dict[str, Any]]:
+    """
+    Analyze several fact packs in ONE model call (shared system prompt, one round trip).
+    Results come back in input order. A single pack goes through analyze().
+    `max_tokens` defaults to AI_MAX_TOKENS per symbol.
+    """
+    if len(facts_list) == 1:
+        return [await analyze(facts_list[0], horizon=horizon, risk=risk, max_tokens=max_tokens)]
+
+    client = _get_client()
+    user_msg = _batch_user_message(facts_list, horizon, risk)
+    n = len(facts_list)
+
+    async def try_model(model_name: str) -> list[Dict[str, Any]]:
+        # Structured Outputs unless the model is known not to support it, then JSON mode
+        formats = [_BATCH_RESPONSE_FORMAT, _JSON_MODE_FORMAT]
+        if _MODEL_CAPS.get(model_name, 0) > 0:
+            formats = formats[1:]
+        for i, fmt in enumerate(formats):
+            try:
+                res = await _call_batch(client, model_name, user_msg, n, fmt, max_tokens or AI_MAX_TOKENS * n)
+                return [_validate_result(r) for r in res]
+            except _MODEL_ERRORS as e:
+                _debug_log(f"{model_name}.Batch.error", str(e))
+                if i == len(formats) - 1:
+                    raise
 
-    # Try PRIMARY, then FALLBACK
     try:
-        return try_all(PRIMARY_MODEL)
-    except Exception as e1:
+        return await try_model(PRIMARY_MODEL)
+    except _MODEL_ERRORS as e1:
         _debug_log("PRIMARY.failure", str(e1))
 
-    return try_all(FALLBACK_MODEL)
+    return await try_model(FALLBACK_MODEL)
@@ -3,24 +3,41 @@ import asyncio
 import discord
 from discord.ext import commands
 
+from intel.http_clients import aclose_all
+
+# Optional libuv-backed event loop (not available on Windows); stdlib asyncio otherwise.
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 intents = discord.Intents.default()
 intents.message_content = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# Every cog runs on this one Bot (one gateway connection, one heartbeat).
+EXTENSIONS = (
+    "intel.cog",
+    "charts.cog",
+    "indicators.indicator_cog",
+    "ai.ai_cog",
+)
+
 @bot.event
 async def on_ready():
     print(f"✅ Logged in as {bot.user} (ID: {bot.user.id})")
 
 async def main():
+    # BOT_EXTENSIONS="intel.cog" loads a subset, e.g. to try a single cog
+    only = [e.strip() for e in os.getenv("BOT_EXTENSIONS", "").split(",") if e.strip()]
     async with bot:
-        # because cog.py lives in the intel package:
-        await bot.load_extension("intel.cog")
-        await bot.load_extension("charts.cog")
-        await bot.load_extension("indicators.indicator_cog")
-        await bot.load_extension("ai.ai_cog")
-        await bot.start(os.environ["DISCORD_TOKEN"])
+        for ext in only or EXTENSIONS:
+            await bot.load_extension(ext)
+        try:
+            await bot.start(os.environ["DISCORD_TOKEN"])
+        finally:
+            await aclose_all()  # shared upstream pools live for the whole process
 
 if __name__ == "__main__":
-    asyncio.run(main())
-    
\ No newline at end of file
+    (uvloop.run if uvloop else asyncio.run)(main())
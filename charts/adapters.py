@@ -1,17 +1,32 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
-from intel.contract import Bar
+from intel.contract import Bar, BarsSoA
 
 
 
 
-def bars_to_df(bars: list[Bar]) -> pd.DataFrame:
-    """Convert list of Bar into time-indexed DataFrame: columns [o,h,l,c,v]."""
+def _ms_index(t) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(np.asarray(t, np.int64), unit="ms", utc=True), name="dt")
+
+
+def bars_to_df(bars: "BarsSoA | list[Bar]") -> pd.DataFrame:
+    """Convert BarsSoA or a list of Bar into time-indexed DataFrame: columns [o,h,l,c,v]."""
     if not bars:
         return pd.DataFrame(columns=["o","h","l","c","v"]).astype({
         "o": float, "h": float, "l": float, "c": float, "v": int
         })
-    df = pd.DataFrame([{ "t": b.t, "o": b.o, "h": b.h, "l": b.l, "c": b.c, "v": b.v } for b in bars])
-    df["dt"] = pd.to_datetime(df["t"], unit="ms", utc=True)
-    df = df.set_index("dt").sort_index()
-    return df[["o","h","l","c","v"]]
+    if isinstance(bars, BarsSoA):
+        # already columnar: wrap the arrays, no per-bar Python objects at all
+        df = pd.DataFrame({"o": bars.o, "h": bars.h, "l": bars.l, "c": bars.c, "v": bars.v},
+                          index=_ms_index(bars.t))
+        return df.sort_index()
+    # column-wise in one pass: no per-row dicts, one dtype inference per column
+    t, o, h, l, c, v = zip(*[(b.t, b.o, b.h, b.l, b.c, b.v) for b in bars])
+    f8 = np.float64
+    df = pd.DataFrame(
+        {"o": np.asarray(o, f8), "h": np.asarray(h, f8), "l": np.asarray(l, f8),
+         "c": np.asarray(c, f8), "v": np.asarray(v)},
+        index=_ms_index(t),
+    )
+    return df.sort_index()
@@ -1,5 +1,8 @@
 from __future__ import annotations
 import io
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import discord
 from discord.ext import commands
 
@@ -13,6 +16,12 @@ from charts import (
 from intel.stock_loader import PolygonClient
 from intel.crypto_loader import CryptoClient
 
+from cache import TTLCache
+
+# Intraday bars move every minute; daily+ bars don't change once the session closes.
+_BARS_TTL = {"minute": 60.0, "hour": 60.0}
+_BARS_TTL_DEFAULT = 3600.0
+
 
 def _is_crypto(sym: str) -> bool:
     s = sym.upper()
@@ -26,11 +35,33 @@ class ChartCog(commands.Cog):
         self.bot = bot
         self.stock = PolygonClient()
         self.crypto = CryptoClient()
+        self._bars_cache = TTLCache(maxsize=256, ttl=_BARS_TTL_DEFAULT)
+        # renders share pooled figures and serialize on them anyway: one worker keeps
+        # them off the event loop
+        self._render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
 
     def cog_unload(self):
-        # close clients gracefully
-        self.bot.loop.create_task(self.stock.aclose())
-        self.bot.loop.create_task(self.crypto.aclose())
+        self._render_pool.shutdown(wait=False, cancel_futures=True)
+        # HTTP pools are process-wide (intel.http_clients) and outlive the cog
+
+    async def _bars(self, sym: str, span: str, lookback: int):
+        """Bars for chart/csv, reused across repeat requests (line -> candle, chart -> csv)."""
+        crypto = _is_crypto(sym)
+        key = ("crypto", sym) if crypto else ("stock", sym, span, lookback)
+        bars = self._bars_cache.get(key)
+        if bars is not None:
+            return bars
+
+        if crypto:
+            b = await self.crypto.bundle(sym, news_limit=0)
+            ttl = _BARS_TTL["hour"]  # crypto candles are hourly and trade 24/7
+        else:
+            b = await self.stock.bundle(
+                sym, bars_timespan=span, bars_lookback=lookback, news_limit=0, events_limit=0
+            )
+            ttl = _BARS_TTL.get(span, _BARS_TTL_DEFAULT)
+        self._bars_cache.set(key, b.bars, ttl=ttl)
+        return b.bars
 
     @commands.command(name="chart")
     async def chart_cmd(
@@ -52,23 +83,16 @@ class ChartCog(commands.Cog):
         """
         sym = symbol.upper().strip()
 
-        if _is_crypto(sym):
-            b = await self.crypto.bundle(sym, news_limit=0)
-        else:
-            b = await self.stock.bundle(
-                sym, bars_timespan=span, bars_lookback=lookback, news_limit=0
-            )
-
-        df = bars_to_df(b.bars)
+        df = bars_to_df(await self._bars(sym, span, lookback))
         if resample:
             df = resample_df(df, resample)
 
         title = f"{sym} — {span} x {lookback}" + (f" ({resample})" if resample else "")
         try:
-            if kind.lower().startswith("cand"):
-                png = render_candles(df, title=title)
-            else:
-                png = render_line_close(df, title=title)
+            render = render_candles if kind.lower().startswith("cand") else render_line_close
+            png = await asyncio.get_running_loop().run_in_executor(
+                self._render_pool, partial(render, df, title=title)
+            )
         except ValueError as e:
             return await ctx.send(f"No data to chart for `{sym}`: {e}")
 
@@ -86,17 +110,10 @@ class ChartCog(commands.Cog):
         """Export OHLCV to CSV. Usage: !csv AAPL [day|week|month] [lookback] [resample? H|D|W|M]"""
         sym = symbol.upper().strip()
 
-        if _is_crypto(sym):
-            b = await self.crypto.bundle(sym, news_limit=0)
-        else:
-            b = await self.stock.bundle(
-                sym, bars_timespan=span, bars_lookback=lookback, news_limit=0
-            )
-
-        df = bars_to_df(b.bars)
+        df = bars_to_df(await self._bars(sym, span, lookback))
         if resample:
             df = resample_df(df, resample)
-        data = df_to_csv_bytes(df)
+        data = await asyncio.to_thread(df_to_csv_bytes, df)
         await ctx.send(
             file=discord.File(io.BytesIO(data), filename=f"{sym}_{span}.csv")
         )
@@ -1,105 +1,178 @@
 from __future__ import annotations
 import io
+import threading
+from functools import wraps
 import matplotlib
 matplotlib.use("Agg") # headless-safe
-import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 
+# zlib level 1: encoding is most of savefig's cost; files grow only slightly
+_PNG_PIL_KWARGS = {"compress_level": 1}
 
 
+# One reusable Figure/Axes per size: building a figure (fonts, spines, tickers)
+# costs more than clearing one. The lock covers render + encode of a pooled figure.
+_FIG_CACHE: dict[tuple[int, int], tuple[Figure, "matplotlib.axes.Axes"]] = {}
+_FIG_LOCK = threading.RLock()
+
+
+def _get_fig(width: int, height: int):
+    """Cached (fig, ax) for this size, cleared and ready to draw (renderers are @_pooled)."""
+    key = (int(width), int(height))
+    hit = _FIG_CACHE.get(key)
+    if hit is None:
+        # plain Figure (not pyplot): no global registry, nothing to close
+        fig = Figure(figsize=(width/100, height/100), dpi=100, constrained_layout=True)
+        hit = _FIG_CACHE[key] = (fig, fig.add_subplot(111))
+    hit[1].clear()
+    return hit
+
+
+def _pooled(fn):
+    """Serialize a renderer: the pooled figures are shared across threads."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _FIG_LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# More candles than this are sub-pixel at 1000px; merge neighbours before drawing.
+_MAX_CANDLES = 400
+
+
+def _compress_bars(df, max_bars: int = _MAX_CANDLES):
+    """Merge each run of k consecutive bars into one OHLCV bar so at most max_bars remain.
+    Count-based (not calendar resampling) so it works the same for any span and gaps."""
+    k = -(-len(df) // max_bars)
+    if k <= 1:
+        return df
+    g = np.arange(len(df)) // k
+    out = df.groupby(g).agg({"o": "first", "h": "max", "l": "min", "c": "last", "v": "sum"})
+    out.index = df.index[::k]
+    return out
+
+
+def _xnum(index):
+    """Matplotlib date floats from a DatetimeIndex in one vectorised call
+    (plotting the index directly converts it Timestamp by Timestamp)."""
+    return mdates.date2num(index.to_numpy(dtype="datetime64[ns]"))
+
+
+def _has_data(s) -> bool:
+    """True if `s` holds at least one finite value; one pass, no dropna copy."""
+    return s is not None and len(s) > 0 and bool(np.isfinite(s.to_numpy()).any())
+
+
+def _png_bytes(fig) -> bytes:
+    """Encode `fig`. Layout comes from constrained_layout at creation:
+    bbox_inches="tight" would render the figure twice per save."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", pil_kwargs=_PNG_PIL_KWARGS)
+    return buf.getvalue()
+
+
+
+
+@_pooled
 def render_line_close(df, *, width=1000, height=450, title: str = "") -> bytes:
     if df.empty:
         raise ValueError("No data to plot")
-    fig = plt.figure(figsize=(width/100, height/100), dpi=100)
-    ax = fig.add_subplot(111)
-    ax.plot(df.index, df["c"], linewidth=1.5)
+    fig, ax = _get_fig(width, height)
+    ax.plot(_xnum(df.index), df["c"].to_numpy(), linewidth=1.5)
+    ax.xaxis_date()
     ax.set_title(title)
     ax.grid(True, alpha=0.25)
     fig.autofmt_xdate()
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png_bytes(fig)
 
 
 
 
+@_pooled
 def render_candles(df, *, width=1000, height=450, title: str = "") -> bytes:
     if df.empty:
         raise ValueError("No data to plot")
-    fig = plt.figure(figsize=(width/100, height/100), dpi=100)
-    ax = fig.add_subplot(111)
-    # primitive candlesticks: wick via vlines, body via thick line
-    for dt, row in df.iterrows():
-        o, h, l, c = float(row.o), float(row.h), float(row.l), float(row.c)
-        ax.vlines(dt, l, h)
-        # up/down color will follow matplotlib defaults; no style forcing
-        ax.plot([dt, dt], [o, c], linewidth=6)
+    df = _compress_bars(df)
+    fig, ax = _get_fig(width, height)
+    # primitive candlesticks: wick (l->h) thin, body (o->c) thick; one collection each
+    o, h, l, c = df[["o", "h", "l", "c"]].to_numpy(dtype=float).T
+    x = _xnum(df.index)
+    wicks = np.stack([np.column_stack([x, l]), np.column_stack([x, h])], axis=1)
+    bodies = np.stack([np.column_stack([x, o]), np.column_stack([x, c])], axis=1)
+    up = np.where(c >= o, "g", "r")
+    ax.add_collection(LineCollection(wicks, linewidths=1, colors=up))
+    ax.add_collection(LineCollection(bodies, linewidths=6, colors=up))
+    ax.xaxis_date()
+    ax.autoscale_view()
     ax.set_title(title)
     ax.grid(True, alpha=0.25)
     fig.autofmt_xdate()
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png_bytes(fig)
 
 
+@_pooled
 def render_line_with_overlays(df, overlays: dict[str, "pd.Series"], *, width=1000, height=450, title="") -> bytes:
-    import io, matplotlib.pyplot as plt
-    fig = plt.figure(figsize=(width/100, height/100), dpi=100)
-    ax = fig.add_subplot(111)
-    ax.plot(df.index, df["c"], linewidth=1.5, label="Close")
+    fig, ax = _get_fig(width, height)
+    x = _xnum(df.index)
+    ax.plot(x, df["c"].to_numpy(), linewidth=1.5, label="Close")
     for name, series in overlays.items():
-        if series is None or series.dropna().empty: 
+        if not _has_data(series):
             continue
-        ax.plot(series.index, series.values, linewidth=1.0, label=name)
+        sx = x if series.index.equals(df.index) else _xnum(series.index)
+        ax.plot(sx, series.to_numpy(), linewidth=1.0, label=name)
+    ax.xaxis_date()
     ax.grid(True, alpha=0.25)
     ax.set_title(title)
     ax.legend(loc="best")
     fig.autofmt_xdate()
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png_bytes(fig)
 
+@_pooled
 def render_series(series, *, width=1000, height=300, title: str = "") -> bytes:
-    import io
-    import matplotlib.pyplot as plt
-    if series is None or series.dropna().empty:
+    if not _has_data(series):
         raise ValueError("No data to plot")
-    fig = plt.figure(figsize=(width/100, height/100), dpi=100)
-    ax = fig.add_subplot(111)
-    ax.plot(series.index, series.values, linewidth=1.5)
+    fig, ax = _get_fig(width, height)
+    ax.plot(_xnum(series.index), series.to_numpy(), linewidth=1.5)
+    ax.xaxis_date()
     ax.set_title(title)
     ax.grid(True, alpha=0.25)
     fig.autofmt_xdate()
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png_bytes(fig)
 
 # --- NEW: render multiple Series on one axes ---
+@_pooled
 def render_multi_series(series_map: dict[str, "pd.Series"], *, width=1000, height=300, title: str = "") -> bytes:
-    import io
-    import matplotlib.pyplot as plt
-    if not series_map or all(s is None or s.dropna().empty for s in series_map.values()):
+    plots = [(name, s) for name, s in (series_map or {}).items() if _has_data(s)]
+    if not plots:
         raise ValueError("No data to plot")
-    fig = plt.figure(figsize=(width/100, height/100), dpi=100)
-    ax = fig.add_subplot(111)
-    for name, s in series_map.items():
-        if s is None or s.dropna().empty:
-            continue
-        ax.plot(s.index, s.values, linewidth=1.2, label=name)
+    fig, ax = _get_fig(width, height)
+    xs = {}
+    for name, s in plots:
+        x = xs.get(id(s.index))
+        if x is None:
+            x = xs[id(s.index)] = _xnum(s.index)
+        ax.plot(x, s.to_numpy(), linewidth=1.2, label=name)
+    ax.xaxis_date()
     ax.set_title(title)
     ax.grid(True, alpha=0.25)
     ax.legend(loc="best")
     fig.autofmt_xdate()
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
+    return _png_bytes(fig)
+
+
+@_pooled
+def _warmup() -> None:
+    """Load fonts/glyph caches and the Agg path at import (cog load), not on the first command.
+    Also pre-creates the pooled figures for the default sizes."""
+    for size in ((1000, 450), (1000, 300)):
+        fig, ax = _get_fig(*size)
+        ax.plot([0, 1], [0, 1])
+        ax.set_title("warmup")
+        _png_bytes(fig)
+
+_warmup()
@@ -2,25 +2,28 @@ from __future__ import annotations
 import pandas as pd
 
 
+# pandas >= 2.2 aliases ("T"/"H"/"M" are deprecated); single letters match the
+# H|D|W|M shorthand the commands accept
 _FREQ_MAP = {
-"min": "T",
-"hour": "H",
+"min": "min",
+"t": "min",
+"hour": "h",
+"h": "h",
 "day": "D",
+"d": "D",
 "week": "W",
-"month": "M",
+"w": "W",
+"month": "ME",
+"m": "ME",
 }
 
+_OHLCV_AGG = {"o": "first", "h": "max", "l": "min", "c": "last", "v": "sum"}
+
 
 def resample_df(df: pd.DataFrame, freq: str) -> pd.DataFrame:
     """Resample OHLCV to a coarser frequency (e.g., 'H','D','W','M')."""
     if df.empty:
         return df
     f = _FREQ_MAP.get(freq.lower(), freq)
-    o = df["o"].resample(f).first()
-    h = df["h"].resample(f).max()
-    l = df["l"].resample(f).min()
-    c = df["c"].resample(f).last()
-    v = df["v"].resample(f).sum()
-    out = pd.concat([o,h,l,c,v], axis=1)
-    out.columns = ["o","h","l","c","v"]
+    out = df[["o", "h", "l", "c", "v"]].resample(f).agg(_OHLCV_AGG)
     return out.dropna(how="any")
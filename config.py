@@ -1,21 +1,30 @@
 import os
+from dataclasses import dataclass
+from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
 
+_REQUIRED = ("DISCORD_TOKEN", "POLYGON_API_KEY", "OPENAI_API_KEY")
+
+
+@dataclass(frozen=True)
 class Setting:
-    DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
-    POLYGON_API_KEY = os.getenv("POLYGON_API_KEY")
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-    CRYPTOPANIC_API_KEY = os.getenv("CRYPTOPANIC_API_KEY")
-    
-    if not DISCORD_TOKEN:
-        print("No DISCORD_TOKEN found. Check .env")
-        raise SystemExit(1)
-    if not POLYGON_API_KEY:
-        print("No POLYGON_API_KEY found. Check .env")
-        raise SystemExit(1)
-    if not OPENAI_API_KEY:
-        print("No OPENAI_API_KEY found. Check .env")
-        raise SystemExit(1)
+    DISCORD_TOKEN: str
+    POLYGON_API_KEY: str
+    OPENAI_API_KEY: str
+    CRYPTOPANIC_API_KEY: Optional[str] = None
+
+
+def _load() -> Setting:
+    env = os.environ
+    for key in _REQUIRED:
+        if not env.get(key):
+            print(f"No {key} found. Check .env")
+            raise SystemExit(1)
+    return Setting(
+        *(env[k] for k in _REQUIRED),
+        CRYPTOPANIC_API_KEY=env.get("CRYPTOPANIC_API_KEY"),
+    )
+
 
-settings = Setting()
+settings = _load()
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+# Optional numba: `@njit(...)` compiles when it is installed and is a no-op otherwise.
+# Callers that would be slow as plain Python check HAVE_NUMBA and use pandas instead.
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
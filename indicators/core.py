@@ -1,82 +1,132 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
-from .helpers import require_cols, typical_price, safe_ewm
+from numpy.lib.stride_tricks import sliding_window_view
+from .helpers import require_cols, typical_price, safe_ewm, ewm_mean, macd_fused, rsi_fused, rolling_mean
+from ._njit import HAVE_NUMBA
+
+# Optional TA-Lib for the window kernels whose output matches the pandas path
+# exactly (SMA, BBANDS with population std). EMA-family indicators stay on
+# ewm_mean and stoch on pandas: TA-Lib seeds EMAs with an SMA and trims the
+# head of STOCH %K, so values would depend on what happens to be installed.
+try:
+    import talib
+    _HAS_TALIB = True
+except ImportError:
+    _HAS_TALIB = False
+
+def _f8(s: pd.Series) -> np.ndarray:
+    return np.ascontiguousarray(s.to_numpy(dtype=np.float64))
+
+def _windowed(a: np.ndarray, n: int, *reducers: str) -> list[np.ndarray]:
+    """
+    Apply each reducer ("mean", "std", "min", "max") to every trailing n-window
+    of `a` from one strided view; the first n-1 slots are NaN like rolling(n).
+    Callers pass float64 (_f8) on every path, with or without TA-Lib, so values
+    never depend on what is installed.
+    """
+    outs = [np.full(a.shape[0], np.nan) for _ in reducers]
+    if a.shape[0] >= n:
+        w = sliding_window_view(a, n)
+        for out, name in zip(outs, reducers):
+            if name == "std":
+                out[n - 1:] = w.std(axis=1, ddof=0, dtype=np.float64)
+            elif name == "mean":
+                out[n - 1:] = w.mean(axis=1, dtype=np.float64)
+            else:
+                out[n - 1:] = getattr(w, name)(axis=1)
+    return outs
 
 # --- Moving Averages ---
 def sma(df: pd.DataFrame, n: int = 20, col: str = "c") -> pd.Series:
     if col not in df.columns: raise ValueError(f"missing column {col}")
-    return df[col].rolling(n, min_periods=n).mean()
+    if _HAS_TALIB and len(df) >= n:
+        return pd.Series(talib.SMA(_f8(df[col]), timeperiod=n), index=df.index, name=col)
+    return rolling_mean(df[col], n)
 
 def ema(df: pd.DataFrame, n: int = 20, col: str = "c") -> pd.Series:
     if col not in df.columns: raise ValueError(f"missing column {col}")
-    return df[col].ewm(span=n, adjust=False, min_periods=n).mean()
+    return ewm_mean(df[col], span=n, min_periods=n)
 
 def vol_sma(df: pd.DataFrame, n: int = 20) -> pd.Series:
     require_cols(df, ["v"])
-    return df["v"].rolling(n, min_periods=n).mean()
+    if _HAS_TALIB and len(df) >= n:
+        return pd.Series(talib.SMA(_f8(df["v"]), timeperiod=n), index=df.index, name="v")
+    return rolling_mean(df["v"], n)
 
 # --- RSI (Wilder 14 by default) ---
 def rsi(df: pd.DataFrame, n: int = 14, col: str = "c") -> pd.Series:
     if col not in df.columns: raise ValueError(f"missing column {col}")
+    if HAVE_NUMBA:
+        return rsi_fused(df[col], n)  # one pass: no delta/gain/loss temporaries
     delta = df[col].diff()
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1/n, adjust=False, min_periods=n).mean()
-    avg_loss = loss.ewm(alpha=1/n, adjust=False, min_periods=n).mean()
+    avg_gain = ewm_mean(gain, alpha=1/n, min_periods=n)
+    avg_loss = ewm_mean(loss, alpha=1/n, min_periods=n)
     rs = avg_gain / avg_loss.replace(0, 1e-12)
     return 100 - (100 / (1 + rs))
 
 # --- MACD ---
 def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9, col: str = "c"):
     if col not in df.columns: raise ValueError(f"missing column {col}")
-    fast_ = df[col].ewm(span=fast, adjust=False, min_periods=fast).mean()
-    slow_ = df[col].ewm(span=slow, adjust=False, min_periods=slow).mean()
+    if HAVE_NUMBA:
+        return macd_fused(df[col], fast, slow, signal)  # one pass for all three EWMs
+    fast_ = ewm_mean(df[col], span=fast, min_periods=fast)
+    slow_ = ewm_mean(df[col], span=slow, min_periods=slow)
     line = fast_ - slow_
-    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    signal_line = ewm_mean(line, span=signal, min_periods=signal)
     hist = line - signal_line
     return line, signal_line, hist
 
 # --- Bollinger Bands ---
 def bollinger_bands(df: pd.DataFrame, n: int = 20, k: float = 2.0, col: str = "c") -> pd.DataFrame:
     if col not in df.columns: raise ValueError(f"missing column {col}")
-    ma = df[col].rolling(n, min_periods=n).mean()
-    std = df[col].rolling(n, min_periods=n).std(ddof=0)
+    if _HAS_TALIB and len(df) >= n:
+        upper, mid, lower = talib.BBANDS(_f8(df[col]), timeperiod=n, nbdevup=k, nbdevdn=k, matype=0)
+        return pd.DataFrame({"mid": mid, "upper": upper, "lower": lower}, index=df.index)
+    ma, std = _windowed(_f8(df[col]), n, "mean", "std")
     upper = ma + k * std
     lower = ma - k * std
-    return pd.DataFrame({"mid": ma, "upper": upper, "lower": lower})
+    return pd.DataFrame({"mid": ma, "upper": upper, "lower": lower}, index=df.index)
 
 # --- ATR (Wilder) ---
 def atr(df: pd.DataFrame, n: int = 14) -> pd.Series:
     require_cols(df, ["h", "l", "c"])
     # true range with previous close
-    prev_close = df["c"].shift(1)
-    tr = pd.concat([
-        (df["h"] - df["l"]).abs(),
-        (df["h"] - prev_close).abs(),
-        (df["l"] - prev_close).abs(),
-    ], axis=1).max(axis=1)
-    return tr.ewm(alpha=1/n, adjust=False, min_periods=n).mean()
+    h = df["h"].to_numpy(dtype=float)
+    l = df["l"].to_numpy(dtype=float)
+    pc = np.empty_like(h)
+    pc[:1] = np.nan
+    pc[1:] = df["c"].to_numpy(dtype=float)[:-1]
+    # fmax skips NaN like DataFrame.max(axis=1): first bar's TR is h - l
+    tr = np.fmax(np.fmax(np.abs(h - l), np.abs(h - pc)), np.abs(l - pc))
+    return ewm_mean(pd.Series(tr, index=df.index), alpha=1/n, min_periods=n)
 
 # --- Stochastic (fast %K and %D) ---
 def stoch(df: pd.DataFrame, k: int = 14, d: int = 3) -> pd.DataFrame:
     require_cols(df, ["h", "l", "c"])
-    low_k = df["l"].rolling(k, min_periods=k).min()
-    high_k = df["h"].rolling(k, min_periods=k).max()
-    pct_k = 100 * (df["c"] - low_k) / (high_k - low_k).replace(0, 1e-12)
-    pct_d = pct_k.rolling(d, min_periods=d).mean()
-    return pd.DataFrame({"%K": pct_k, "%D": pct_d})
+    (low_k,) = _windowed(_f8(df["l"]), k, "min")
+    (high_k,) = _windowed(_f8(df["h"]), k, "max")
+    rng = high_k - low_k
+    rng[rng == 0] = 1e-12
+    pct_k = 100 * (_f8(df["c"]) - low_k) / rng
+    (pct_d,) = _windowed(pct_k, d, "mean")
+    return pd.DataFrame({"%K": pct_k, "%D": pct_d}, index=df.index)
 
 # --- VWAP (session-agnostic, cumulative) ---
 def vwap(df: pd.DataFrame) -> pd.Series:
     require_cols(df, ["h", "l", "c", "v"])
-    tp = typical_price(df)
-    pv = tp * df["v"]
-    cum_pv = pv.cumsum()
-    cum_v = df["v"].cumsum().replace(0, 1e-12)
-    return cum_pv / cum_v
+    tp = typical_price(df).to_numpy()
+    v = df["v"].to_numpy(dtype=float)
+    cum_pv = np.nancumsum(tp * v)
+    cum_v = np.nancumsum(v)
+    cum_v[cum_v == 0] = 1e-12
+    return pd.Series(cum_pv / cum_v, index=df.index)
 
 # --- On-Balance Volume ---
 def obv(df: pd.DataFrame) -> pd.Series:
     require_cols(df, ["c", "v"])
-    direction = df["c"].diff().fillna(0).clip(-1, 1)
-    return (direction.apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0)) * df["v"]).cumsum()
+    # +1 / -1 / 0 per bar (NaN closes count as flat), vectorized
+    direction = np.sign(df["c"].diff()).fillna(0)
+    return (direction * df["v"]).cumsum()
@@ -1,6 +1,9 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
+from ._njit import njit, HAVE_NUMBA
+
 def require_cols(df: pd.DataFrame, cols: list[str]) -> None:
     missing = [c for c in cols if c not in df.columns]
     if missing:
@@ -8,7 +11,140 @@ def require_cols(df: pd.DataFrame, cols: list[str]) -> None:
 
 def typical_price(df: pd.DataFrame) -> pd.Series:
     require_cols(df, ["h", "l", "c"])
-    return (df["h"] + df["l"] + df["c"]) / 3.0
+    # one output buffer, added into in place: no h+l / (h+l)+c temporaries
+    tp = np.add(df["h"].to_numpy(dtype=float), df["l"].to_numpy(dtype=float))
+    tp += df["c"].to_numpy(dtype=float)
+    tp *= 1.0 / 3.0
+    return pd.Series(tp, index=df.index)
 
 def safe_ewm(s: pd.Series, span: int):
     return s.ewm(span=span, adjust=False, min_periods=span)
+
+@njit(cache=True)
+def _ewm_step(weighted, old_wt, nobs, cur, alpha):
+    """One step of pandas' ewm(adjust=False, ignore_na=False) mean; start from (nan, 1.0, 0)."""
+    is_obs = cur == cur
+    if is_obs:
+        nobs += 1
+    if weighted == weighted:
+        old_wt *= 1.0 - alpha
+        if is_obs:
+            if weighted != cur:
+                weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif is_obs:
+        weighted = cur
+    return weighted, old_wt, nobs
+
+@njit(cache=True)
+def _ewm_alpha(x, alpha, min_periods):
+    """pandas ewm(adjust=False, ignore_na=False).mean() as one scalar recurrence."""
+    out = np.empty(x.shape[0])
+    weighted, old_wt, nobs = np.nan, 1.0, 0
+    for i in range(x.shape[0]):
+        weighted, old_wt, nobs = _ewm_step(weighted, old_wt, nobs, x[i], alpha)
+        out[i] = weighted if nobs >= min_periods else np.nan
+    return out
+
+@njit(cache=True)
+def _macd_kernel(x, fast, slow, signal):
+    """Fast/slow/signal EWMs fused into one pass over x; same values as three ewm_mean calls."""
+    n = x.shape[0]
+    af, as_, ag = 2.0 / (fast + 1.0), 2.0 / (slow + 1.0), 2.0 / (signal + 1.0)
+    line = np.empty(n)
+    sig = np.empty(n)
+    wf, of, nf = np.nan, 1.0, 0
+    ws, os_, ns = np.nan, 1.0, 0
+    wg, og, ng = np.nan, 1.0, 0
+    for i in range(n):
+        wf, of, nf = _ewm_step(wf, of, nf, x[i], af)
+        ws, os_, ns = _ewm_step(ws, os_, ns, x[i], as_)
+        ln = (wf if nf >= fast else np.nan) - (ws if ns >= slow else np.nan)
+        wg, og, ng = _ewm_step(wg, og, ng, ln, ag)
+        line[i] = ln
+        sig[i] = wg if ng >= signal else np.nan
+    return line, sig
+
+def ewm_mean(s: pd.Series, *, alpha: float | None = None, span: int | None = None,
+             min_periods: int = 0) -> pd.Series:
+    """Non-adjusted EWM mean; numba recurrence when available, else pandas."""
+    a = alpha if alpha is not None else 2.0 / (span + 1.0)
+    if not HAVE_NUMBA:
+        return s.ewm(alpha=a, adjust=False, min_periods=min_periods).mean()
+    vals = _ewm_alpha(s.to_numpy(dtype=np.float64), a, max(int(min_periods), 1))
+    return pd.Series(vals, index=s.index, name=s.name)
+
+@njit(cache=True)
+def _rsi_kernel(x, n):
+    """Wilder RSI in one pass: delta, gain/loss split and both EWMs kept in registers."""
+    size = x.shape[0]
+    out = np.empty(size)
+    alpha = 1.0 / n
+    mp = max(n, 1)
+    wg, og, ng = np.nan, 1.0, 0
+    wl, ol, nl = np.nan, 1.0, 0
+    prev = np.nan
+    for i in range(size):
+        d = x[i] - prev  # NaN on the first bar, like diff()
+        prev = x[i]
+        gain = d if d > 0.0 else (0.0 if d == d else np.nan)
+        loss = -d if d < 0.0 else (0.0 if d == d else np.nan)
+        wg, og, ng = _ewm_step(wg, og, ng, gain, alpha)
+        wl, ol, nl = _ewm_step(wl, ol, nl, loss, alpha)
+        ag = wg if ng >= mp else np.nan
+        al = wl if nl >= mp else np.nan
+        if al == 0.0:
+            al = 1e-12
+        out[i] = 100.0 - 100.0 / (1.0 + ag / al)
+    return out
+
+@njit(cache=True)
+def _rolling_mean(x, n):
+    """rolling(n, min_periods=n).mean() as one running sum; a NaN poisons the n windows it is in."""
+    size = x.shape[0]
+    out = np.full(size, np.nan)
+    total = 0.0
+    nans = 0
+    for i in range(size):
+        v = x[i]
+        if v == v:
+            total += v
+        else:
+            nans += 1
+        if i >= n:
+            old = x[i - n]
+            if old == old:
+                total -= old
+            else:
+                nans -= 1
+        if i >= n - 1 and nans == 0:
+            out[i] = total / n
+    return out
+
+def rolling_mean(s: pd.Series, n: int) -> pd.Series:
+    """Trailing n-mean; numba running sum when available, else pandas rolling."""
+    if not HAVE_NUMBA:
+        return s.rolling(n, min_periods=n).mean()
+    return pd.Series(_rolling_mean(s.to_numpy(dtype=np.float64), max(int(n), 1)), index=s.index, name=s.name)
+
+def rsi_fused(s: pd.Series, n: int) -> pd.Series:
+    """RSI Series from _rsi_kernel; call only when HAVE_NUMBA."""
+    return pd.Series(_rsi_kernel(s.to_numpy(dtype=np.float64), n), index=s.index)
+
+def macd_fused(s: pd.Series, fast: int, slow: int, signal: int):
+    """(line, signal, hist) Series from _macd_kernel; call only when HAVE_NUMBA."""
+    line, sig = _macd_kernel(s.to_numpy(dtype=np.float64), max(fast, 1), max(slow, 1), max(signal, 1))
+    idx = s.index
+    return pd.Series(line, index=idx), pd.Series(sig, index=idx), pd.Series(line - sig, index=idx)
+
+def _warmup() -> None:
+    """Compile (or load from the on-disk cache) every kernel at import, i.e. on cog
+    load, so the first !rsi/!macd/!sma doesn't pay numba's JIT latency."""
+    x = np.arange(8, dtype=np.float64)
+    _ewm_alpha(x, 0.5, 1)
+    _macd_kernel(x, 2, 3, 2)
+    _rsi_kernel(x, 2)
+    _rolling_mean(x, 2)
+
+if HAVE_NUMBA:
+    _warmup()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import io
+import asyncio
 import discord
 from discord.ext import commands
 from charts.adapters import bars_to_df
@@ -12,6 +13,13 @@ from charts.renderers import (
 from intel.stock_loader import PolygonClient
 from intel.crypto_loader import CryptoClient
 from indicators.core import sma, ema, rsi, macd, bollinger_bands, atr, stoch, vwap, obv, vol_sma
+from cache import TTLCache
+
+# Bars (and indicators derived from them) are reused for about one bar length;
+# same values as charts/cog.py _BARS_TTL so both cogs see the same forming candle.
+_DF_TTL = {"minute": 60.0, "hour": 60.0}
+_DF_TTL_DEFAULT = 3600.0
+_MEMO_MAX = 64  # distinct (indicator, params) results kept per frame
 
 def _is_crypto(sym: str) -> bool:
     s = sym.upper()
@@ -22,54 +30,76 @@ class IndicatorCog(commands.Cog):
         self.bot = bot
         self.stock = PolygonClient()
         self.crypto = CryptoClient()
-
-    def cog_unload(self):
-        self.bot.loop.create_task(self.stock.aclose())
-        self.bot.loop.create_task(self.crypto.aclose())
+        # (df, {indicator key: result}): results live and expire with their frame
+        self._df_cache = TTLCache(maxsize=128, ttl=_DF_TTL_DEFAULT)
 
     async def _df_for(self, symbol: str, span="day", lookback=200):
-        if _is_crypto(symbol):
-            b = await self.crypto.bundle(symbol, news_limit=0)
+        sym = symbol.upper()
+        crypto = _is_crypto(sym)
+        key = ("crypto", sym) if crypto else ("stock", sym, span, lookback)
+        hit = self._df_cache.get(key)
+        if hit is not None:
+            return hit
+        if crypto:
+            b = await self.crypto.bundle(sym, news_limit=0)
+            ttl = _DF_TTL["hour"]  # hourly candles
         else:
-            b = await self.stock.bundle(symbol, bars_timespan=span, bars_lookback=lookback, news_limit=0)
-        return bars_to_df(b.bars)
+            b = await self.stock.bundle(
+                sym, bars_timespan=span, bars_lookback=lookback, news_limit=0, events_limit=0
+            )
+            ttl = _DF_TTL.get(span, _DF_TTL_DEFAULT)
+        entry = (bars_to_df(b.bars), {})
+        self._df_cache.set(key, entry, ttl=ttl)
+        return entry
+
+    @staticmethod
+    def _calc(memo: dict, fn, df, **params):
+        """Memoized fn(df, **params); `memo` is the dict cached alongside df."""
+        key = (fn.__name__, tuple(sorted(params.items())))
+        out = memo.get(key)
+        if out is None:
+            if len(memo) >= _MEMO_MAX:
+                memo.clear()
+            out = memo[key] = fn(df, **params)
+        return out
 
     @commands.command(name="sma")
     async def sma_cmd(self, ctx, symbol: str, n: int = 50, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        s = sma(df, n)
-        png = render_line_with_overlays(df, {f"SMA({n})": s}, title=f"{symbol.upper()} — SMA({n})")
+        df, memo = await self._df_for(symbol, span, lookback)
+        s = self._calc(memo, sma, df, n=n)
+        png = await asyncio.to_thread(render_line_with_overlays, df, {f"SMA({n})": s}, title=f"{symbol.upper()} — SMA({n})")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_SMA{n}.png"))
 
     @commands.command(name="ema")
     async def ema_cmd(self, ctx, symbol: str, n: int = 21, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        e = ema(df, n)
-        png = render_line_with_overlays(df, {f"EMA({n})": e}, title=f"{symbol.upper()} — EMA({n})")
+        df, memo = await self._df_for(symbol, span, lookback)
+        e = self._calc(memo, ema, df, n=n)
+        png = await asyncio.to_thread(render_line_with_overlays, df, {f"EMA({n})": e}, title=f"{symbol.upper()} — EMA({n})")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_EMA{n}.png"))
 
     @commands.command(name="bb")
     async def bb_cmd(self, ctx, symbol: str, n: int = 20, k: float = 2.0, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        bb = bollinger_bands(df, n=n, k=k)
+        df, memo = await self._df_for(symbol, span, lookback)
+        bb = self._calc(memo, bollinger_bands, df, n=n, k=k)
         overlays = {f"BB mid({n})": bb["mid"], f"BB upper({n},{k})": bb["upper"], f"BB lower({n},{k})": bb["lower"]}
-        png = render_line_with_overlays(df, overlays, title=f"{symbol.upper()} — Bollinger Bands")
+        png = await asyncio.to_thread(render_line_with_overlays, df, overlays, title=f"{symbol.upper()} — Bollinger Bands")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_BB.png"))
 
     @commands.command(name="rsi")
     async def rsi_cmd(self, ctx, symbol: str, n: int = 14, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        series = rsi(df, n)
+        df, memo = await self._df_for(symbol, span, lookback)
+        series = self._calc(memo, rsi, df, n=n)
         # quick single-panel chart for RSI
-        png = render_series(series, title=f"{symbol.upper()} — RSI({n})")
+        png = await asyncio.to_thread(render_series, series, title=f"{symbol.upper()} — RSI({n})")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_RSI{n}.png"))
 
     @commands.command(name="macd")
     async def macd_cmd(self, ctx, symbol: str, fast: int = 12, slow: int = 26, signal: int = 9, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        line, sig, hist = macd(df, fast=fast, slow=slow, signal=signal)
+        df, memo = await self._df_for(symbol, span, lookback)
+        line, sig, hist = self._calc(memo, macd, df, fast=fast, slow=slow, signal=signal)
         overlays = {"MACD": line, "Signal": sig, "Hist": hist}
-        png = render_multi_series(
+        png = await asyncio.to_thread(
+            render_multi_series,
             {"MACD": line, "Signal": sig, "Hist": hist},
             title=f"{symbol.upper()} — MACD({fast},{slow},{signal})"
         )
@@ -77,23 +107,24 @@ class IndicatorCog(commands.Cog):
 
     @commands.command(name="atr")
     async def atr_cmd(self, ctx, symbol: str, n: int = 14, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        s = atr(df, n)
-        png = render_series(s, title=f"{symbol.upper()} — ATR({n})")
+        df, memo = await self._df_for(symbol, span, lookback)
+        s = self._calc(memo, atr, df, n=n)
+        png = await asyncio.to_thread(render_series, s, title=f"{symbol.upper()} — ATR({n})")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_ATR{n}.png"))
 
     @commands.command(name="vwap")
     async def vwap_cmd(self, ctx, symbol: str, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        s = vwap(df)
-        png = render_line_with_overlays(df, {"VWAP": s}, title=f"{symbol.upper()} — VWAP")
+        df, memo = await self._df_for(symbol, span, lookback)
+        s = self._calc(memo, vwap, df)
+        png = await asyncio.to_thread(render_line_with_overlays, df, {"VWAP": s}, title=f"{symbol.upper()} — VWAP")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_VWAP.png"))
 
     @commands.command(name="stoch")
     async def stoch_cmd(self, ctx, symbol: str, k: int = 14, d: int = 3, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        st = stoch(df, k=k, d=d)
-        png = render_multi_series(
+        df, memo = await self._df_for(symbol, span, lookback)
+        st = self._calc(memo, stoch, df, k=k, d=d)
+        png = await asyncio.to_thread(
+            render_multi_series,
             {"%K": st["%K"], "%D": st["%D"]},
             title=f"{symbol.upper()} — Stoch({k},{d})"
         )
@@ -101,9 +132,9 @@ class IndicatorCog(commands.Cog):
 
     @commands.command(name="obv")
     async def obv_cmd(self, ctx, symbol: str, span: str = "day", lookback: int = 200):
-        df = await self._df_for(symbol, span, lookback)
-        s = obv(df)
-        png = render_series(s, title=f"{symbol.upper()} — OBV")
+        df, memo = await self._df_for(symbol, span, lookback)
+        s = self._calc(memo, obv, df)
+        png = await asyncio.to_thread(render_series, s, title=f"{symbol.upper()} — OBV")
         await ctx.send(file=discord.File(io.BytesIO(png), filename=f"{symbol.upper()}_OBV.png"))
 
 async def setup(bot: commands.Bot):
@@ -2,16 +2,22 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from datetime import datetime
 from typing import Optional
 
 import discord
 from discord.ext import commands
 
+from cache import TTLCache, SingleFlight
+
 # Loaders you built
 from intel.stock_loader import PolygonClient  # stocks (Polygon + yfinance events/options)
 from intel.crypto_loader import CryptoClient  # crypto (Coinbase + Binance + CryptoPanic)
 
+# Repeat !price/!news/!funding on one pair within this window reuse the bundle
+CRYPTO_BUNDLE_TTL = float(os.getenv("CRYPTO_BUNDLE_TTL", "15"))
+
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
@@ -45,19 +51,30 @@ class MarketCog(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        # build clients here; they manage their own httpx sessions
+        # both borrow the process-wide pools in intel.http_clients (closed by bot.py)
         self.stock = PolygonClient()
         self.crypto = CryptoClient()
+        self._crypto_cache = TTLCache(maxsize=256, ttl=CRYPTO_BUNDLE_TTL)
+        self._inflight = SingleFlight()  # a cold key fetches once however many users ask
 
-    def cog_unload(self):
-        # close async clients gracefully
-        async def _close():
-            await asyncio.gather(
-                self.stock.aclose(),
-                self.crypto.aclose(),
-                return_exceptions=True,
-            )
-        asyncio.create_task(_close())
+    async def _crypto_bundle(self, sym: str, news_limit: int):
+        """CryptoClient.bundle memoized on (pair, news_limit) for CRYPTO_BUNDLE_TTL seconds."""
+        key = (sym.upper(), news_limit)
+        b = self._crypto_cache.get(key)
+        if b is not None:
+            return b
+
+        async def _fetch():
+            fresh = await self.crypto.bundle(sym, news_limit=news_limit)
+            self._crypto_cache.set(key, fresh)
+            return fresh
+
+        return await self._inflight.do(key, _fetch)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # first !price shouldn't pay the Polygon handshake
+        await self.stock.warmup()
 
     # ------------------------------- Commands --------------------------------
 
@@ -71,7 +88,7 @@ class MarketCog(commands.Cog):
 
         try:
             if _is_crypto_symbol(sym):
-                b = await self.crypto.bundle(sym, news_limit=0)
+                b = await self._crypto_bundle(sym, news_limit=0)
                 q = b.quote
                 if not q:
                     return await ctx.send(f"Could not fetch quote for `{sym}`.")
@@ -87,7 +104,7 @@ class MarketCog(commands.Cog):
                     title=f"{sym} — Crypto",
                     description=f"**Prev (24h open proxy):** {_fmt_usd(q.prevClose)}\n"
                                 f"**High/Low (24h):** {_fmt_usd(q.high)} / {_fmt_usd(q.low)}\n"
-                                f"**Volume (24h):** {q.volume:,}"
+                                f"**Volume (24h):** {q.volume:,.0f}"
                                 f"{oi_part}{fund_part}",
                     color=discord.Color.gold(),
                     timestamp=q.as_of,
@@ -96,7 +113,7 @@ class MarketCog(commands.Cog):
                 return await ctx.send(embed=embed)
 
             # Stock path
-            b = await self.stock.bundle(sym, bars_timespan="day", bars_lookback=1, news_limit=0)
+            b = await self.stock.bundle(sym, bars_timespan="day", bars_lookback=1, news_limit=0, events_limit=0)
             q = b.quote
             if not q:
                 return await ctx.send(f"Could not fetch quote for `{sym}`.")
@@ -104,7 +121,7 @@ class MarketCog(commands.Cog):
                 title=f"{sym} — Stock",
                 description=f"**Prev Close:** {_fmt_usd(q.prevClose)}\n"
                             f"**High/Low (Prev Session):** {_fmt_usd(q.high)} / {_fmt_usd(q.low)}\n"
-                            f"**Volume (Prev Session):** {q.volume:,}",
+                            f"**Volume (Prev Session):** {q.volume:,.0f}",
                 color=discord.Color.blue(),
                 timestamp=q.as_of,
             )
@@ -125,7 +142,7 @@ class MarketCog(commands.Cog):
 
         try:
             if _is_crypto_symbol(sym):
-                b = await self.crypto.bundle(sym, news_limit=limit)
+                b = await self._crypto_bundle(sym, news_limit=limit)
                 items = b.news[:limit]
                 if not items:
                     return await ctx.send(f"No recent crypto news for `{sym}`.")
@@ -151,7 +168,7 @@ class MarketCog(commands.Cog):
                 return await ctx.send(embed=embed)
 
             # Stock path
-            b = await self.stock.bundle(sym, news_limit=limit, bars_lookback=1)
+            b = await self.stock.bundle(sym, news_limit=limit, bars_lookback=1, events_limit=0)
             items = b.news[:limit]
             if not items:
                 return await ctx.send(f"No recent stock news for `{sym}`.")
@@ -182,7 +199,7 @@ class MarketCog(commands.Cog):
             return await ctx.send("Use a crypto symbol like `BTC-USD` or `ETH-USD`.")
 
         try:
-            b = await self.crypto.bundle(sym, news_limit=0)
+            b = await self._crypto_bundle(sym, news_limit=0)
             if not b.funding and not b.open_interest:
                 return await ctx.send(f"No derivatives data available for `{sym}` right now.")
             lines = []
@@ -246,10 +263,11 @@ class MarketCog(commands.Cog):
                     return await ctx.send(f"No expirations found for `{sym}`.")
                 exp_dt = exps[0]
 
-            chain = await self.stock.option_chain(sym, exp_dt)
-
-            # get prevClose for ATM selection
-            b = await self.stock.bundle(sym, bars_lookback=1, news_limit=0)
+            # chain + prevClose (for ATM selection) are independent: fetch concurrently
+            chain, b = await asyncio.gather(
+                self.stock.option_chain(sym, exp_dt),
+                self.stock.bundle(sym, bars_lookback=1, news_limit=0, events_limit=0),
+            )
             px = b.quote.prevClose if b.quote else 0.0
 
             def closest(lst, x):
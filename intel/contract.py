@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from operator import itemgetter
+from typing import Iterator, List, Optional, Sequence, Union
 from datetime import datetime
 
-@dataclass
+import numpy as np
+
+@dataclass(slots=True)
 class Quote:
     symbol: str
     prevClose: float
@@ -12,7 +15,7 @@ class Quote:
     as_of: datetime
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OptionContract:
     contract_symbol: str     # e.g., AAPL240920C00190000
     underlying: str          # e.g., AAPL
@@ -21,7 +24,7 @@ class OptionContract:
     expiration: datetime
     in_the_money: bool
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OptionQuote:
     last: Optional[float]
     bid: Optional[float]
@@ -30,19 +33,19 @@ class OptionQuote:
     open_interest: Optional[int]
     implied_vol: Optional[float]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OptionSnapshot:
     contract: OptionContract
     quote: OptionQuote
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OptionChain:
     underlying: str
     expiration: datetime
     calls: List[OptionSnapshot]
     puts: List[OptionSnapshot]
 
-@dataclass
+@dataclass(slots=True)
 class Bar:
     t: int   # ms since epoch
     o: float
@@ -51,7 +54,60 @@ class Bar:
     c: float
     v: int
 
-@dataclass
+_BAR_FIELDS = ("t", "o", "h", "l", "c", "v")
+
+@dataclass(frozen=True, slots=True, eq=False)
+class BarsSoA:
+    """Columnar bars: one contiguous array per field (t int64 ms, o/h/l/c/v float64;
+    v stays fractional so sums over crypto candles aren't truncated per bar).
+    len/iteration/int index yield Bar and a slice yields a sliced BarsSoA, so list[Bar]
+    consumers keep working. eq=False: the generated __eq__/__hash__ can't compare
+    ndarray fields, so instances compare (and hash) by identity."""
+    t: np.ndarray
+    o: np.ndarray
+    h: np.ndarray
+    l: np.ndarray
+    c: np.ndarray
+    v: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[float]], *,
+                  columns: Sequence[str] = _BAR_FIELDS, t_scale: float = 1) -> "BarsSoA":
+        """Parse row-major payloads in one numpy call; `columns` names each row position,
+        `t_scale` converts the time column to ms (1000 for epoch seconds)."""
+        arr = np.asarray(rows, dtype=np.float64).reshape(-1, len(columns))
+        col = {name: arr[:, i] for i, name in enumerate(columns)}
+        return cls(
+            t=(col["t"] * t_scale).astype(np.int64),
+            o=np.ascontiguousarray(col["o"]),
+            h=np.ascontiguousarray(col["h"]),
+            l=np.ascontiguousarray(col["l"]),
+            c=np.ascontiguousarray(col["c"]),
+            v=np.ascontiguousarray(col["v"]),
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[dict]) -> "BarsSoA":
+        """Parse dict-per-bar payloads (Polygon aggregates: t/o/h/l/c/v keys, t in ms).
+        itemgetter pulls the six fields per bar in C; no Bar objects are built."""
+        return cls.from_rows(list(map(itemgetter(*_BAR_FIELDS), records)))
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Bar, "BarsSoA"]:
+        if isinstance(i, slice):  # views, no copy
+            return BarsSoA(*(getattr(self, f)[i] for f in _BAR_FIELDS))
+        return Bar(int(self.t[i]), float(self.o[i]), float(self.h[i]),
+                   float(self.l[i]), float(self.c[i]), int(self.v[i]))
+
+    def __iter__(self) -> Iterator[Bar]:
+        # positional, field order = _BAR_FIELDS; map() drives the loop in C
+        cols = [getattr(self, f) for f in _BAR_FIELDS]
+        cols[-1] = cols[-1].astype(np.int64)  # Bar.v is an int
+        return map(Bar, *(c.tolist() for c in cols))
+
+@dataclass(slots=True)
 class NewsItem:
     publisher: str
     title: str
@@ -63,7 +119,7 @@ class NewsItem:
     currencies: List[str] = field(default_factory=list)
     score: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class Dividend:
     cash_amount: float                  # per share
     declaration_date: Optional[datetime]
@@ -72,12 +128,12 @@ class Dividend:
     record_date: Optional[datetime]
     frequency: Optional[int]            # 1=annual, 4=quarterly, etc.
 
-@dataclass
+@dataclass(slots=True)
 class Split:
     ratio: str                          # e.g. "4/1"
     execution_date: Optional[datetime]
 
-@dataclass
+@dataclass(slots=True)
 class Earnings:
     fiscal_period: Optional[str]        # e.g. "Q2 2025"
     eps: Optional[float]
@@ -86,24 +142,24 @@ class Earnings:
     surprise: Optional[float]           # eps - consensus_eps
     revenue: Optional[float]            # total revenue if provided
 
-@dataclass
+@dataclass(slots=True)
 class OpenInterest:
     symbol: str           # e.g. "BTCUSDT" on Binance
     amount: float         # notional OI (contracts or base coin; see provider note)
     ts: Optional[datetime]
     currency: Optional[str] = None  # e.g. "USDT" or base coin
 
-@dataclass
+@dataclass(slots=True)
 class Funding:
     symbol: str
     rate: float                         # e.g. 0.0001 means 0.01%
     next_funding_time: Optional[datetime]
 
-@dataclass
+@dataclass(slots=True)
 class IntelBundle:
     symbol: str
     quote: Optional[Quote]
-    bars: list[Bar]
+    bars: Union[BarsSoA, List[Bar]]  # both loaders yield BarsSoA; list[Bar] still accepted
     news: list[NewsItem]
     dividends: list[Dividend]
     splits: list[Split]
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import asyncio
+import random
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timezone
 
-import httpx
+import aiohttp
+import numpy as np
+import orjson
 
+from cache import TTLCache, SingleFlight
 from config import settings
+from .http_clients import get_coinbase_client, get_binance_client, get_cryptopanic_client, aclose_all
 from .contract import (
-    Quote, Bar, NewsItem,
+    Quote, BarsSoA, NewsItem,
     Dividend, Split, Earnings,   # present for IntelBundle shape (unused for crypto)
     IntelBundle,
     OpenInterest, Funding,
@@ -18,17 +24,45 @@ from .contract import (
 # Helpers
 # -----------------------------------------------------------------------------
 
+# Optional C ISO-8601 parser (handles the trailing "Z" itself); stdlib otherwise.
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(s: str) -> datetime:
+        return datetime.fromisoformat(s.replace("Z", "+00:00"))
+
+async def _json(r: aiohttp.ClientResponse) -> Any:
+    r.raise_for_status()
+    return orjson.loads(await r.read())  # straight from bytes; no str decode step
+
+def _retryable(e: BaseException) -> bool:
+    # 429 / 5xx / dropped connections are transient; 4xx (incl. Binance's 418 ban) are not
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status == 429 or e.status >= 500
+    return isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+async def _with_retry(factory, *, max_retries: int = 2, base: float = 0.2, cap: float = 1.0):
+    """Await factory(), retrying transient failures with jittered exponential backoff."""
+    tries = 0
+    while True:
+        try:
+            return await factory()
+        except Exception as e:
+            tries += 1
+            if tries > max_retries or not _retryable(e):
+                raise
+            await asyncio.sleep(min(cap, base * 2 ** (tries - 1)) * (0.5 + random.random()))
+
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
-def _epoch_sec_to_ms(t: int | float) -> int:
-    return int(float(t) * 1000)
-
 def _ms_to_utc(ms: Optional[int]) -> Optional[datetime]:
     if ms is None:
         return None
-    return datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc)
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
 
+# User-typed symbols come from a small set; memoize the string munging (bounded).
+@lru_cache(maxsize=1024)
 def _symbol_to_binance_perp(product_id: str) -> str:
     """
     Map spot product like 'BTC-USD' -> 'BTCUSDT' (Binance perp).
@@ -40,31 +74,46 @@ def _symbol_to_binance_perp(product_id: str) -> str:
         return base + "USDT"
     return s
 
+@lru_cache(maxsize=1024)
 def _product_to_currency(product_id: str) -> str:
     return "USDT" if product_id.upper().endswith("USD") else "USD"
 
+# Short-lived upstream caches: 24h stats / OI move slowly, funding even slower.
+_STATS_CACHE = TTLCache(maxsize=512, ttl=30)
+_OI_CACHE = TTLCache(maxsize=512, ttl=30)
+_FUNDING_CACHE = TTLCache(maxsize=512, ttl=60)
+_CANDLES_CACHE = TTLCache(maxsize=256, ttl=60)
+_CANDLES_MAX_TTL = 300  # cap so the still-forming daily candle isn't hours stale
+_INFLIGHT = SingleFlight()
+
+async def _cached(cache: TTLCache, key, factory, ttl: Optional[float] = None):
+    """cache hit, else one shared fetch per key (concurrent misses coalesce)."""
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+
+    async def _load():
+        value = await _with_retry(factory)
+        cache.set(key, value, ttl=ttl)
+        return value
+
+    return await _INFLIGHT.do((id(cache), key), _load)
+
 # -----------------------------------------------------------------------------
 # Coinbase (spot) client: OHLCV + 24h stats -> Quote + Bars
 # -----------------------------------------------------------------------------
 
-_CB_BASE = "https://api.exchange.coinbase.com"
-
 class CoinbaseClient:
     """Spot data: candles/24h stats → Quote + Bars."""
-    def __init__(self, timeout: float = 15.0, base: str = _CB_BASE):
-        self.http = httpx.AsyncClient(
-            base_url=base,
-            timeout=timeout,
-            headers={"User-Agent": "discord-bot/crypto-intel"}
-        )
-
-    async def aclose(self):
-        await self.http.aclose()
+    def __init__(self, http: Optional[aiohttp.ClientSession] = None):
+        self.http = http or get_coinbase_client()
 
     async def stats_24h(self, product_id: str) -> Dict[str, Any]:
-        r = await self.http.get(f"/products/{product_id}/stats")
-        r.raise_for_status()
-        return r.json()
+        return await _cached(_STATS_CACHE, product_id.upper(), lambda: self._stats_24h(product_id))
+
+    async def _stats_24h(self, product_id: str) -> Dict[str, Any]:
+        async with self.http.get(f"/products/{product_id}/stats") as r:
+            return await _json(r)
 
     async def candles(
         self,
@@ -72,38 +121,34 @@ class CoinbaseClient:
         *,
         granularity: int = 3600,
         limit: int = 300
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         GET /products/{product_id}/candles?granularity=...
         Returns rows: [ time, low, high, open, close, volume ] (newest first).
-        We reverse to oldest->newest and slice to limit.
+        We reverse to oldest->newest and keep the newest `limit`; result is an (n, 6) float64 array.
         """
-        r = await self.http.get(
+        rows = await _cached(
+            _CANDLES_CACHE, (product_id.upper(), granularity),
+            lambda: self._candles(product_id, granularity),
+            ttl=max(1, min(granularity // 4, _CANDLES_MAX_TTL)),
+        )
+        return rows if len(rows) <= limit else rows[len(rows) - limit:]
+
+    async def _candles(self, product_id: str, granularity: int) -> np.ndarray:
+        async with self.http.get(
             f"/products/{product_id}/candles",
             params={"granularity": granularity},
-        )
-        r.raise_for_status()
-        data = r.json()
-        rows = list(reversed(data)) if isinstance(data, list) else []
-        return rows[:limit]
+        ) as r:
+            data = await _json(r)
+        if not isinstance(data, list) or not data:
+            return np.empty((0, 6))
+        # parsed rows go straight into one array; reversing is a view, not a copy
+        return np.asarray(data, dtype=np.float64)[::-1]
 
     @staticmethod
-    def _rows_to_bars(rows: List[List[float]]) -> List[Bar]:
-        bars: List[Bar] = []
-        for row in rows:
-            # [ time, low, high, open, close, volume ]
-            t_sec, low, high, open_, close, vol = row
-            bars.append(
-                Bar(
-                    t=_epoch_sec_to_ms(t_sec),
-                    o=float(open_),
-                    h=float(high),
-                    l=float(low),
-                    c=float(close),
-                    v=int(float(vol)),
-                )
-            )
-        return bars
+    def _rows_to_bars(rows: np.ndarray) -> BarsSoA:
+        # [ time, low, high, open, close, volume ], time in epoch seconds
+        return BarsSoA.from_rows(rows, columns=("t", "l", "h", "o", "c", "v"), t_scale=1000)
 
     async def quote(self, product_id: str) -> Quote:
         """
@@ -127,13 +172,32 @@ class CoinbaseClient:
             as_of=_utc_now(),
         )
 
+    @staticmethod
+    def quote_from_bars(product_id: str, bars: BarsSoA, granularity: int) -> Optional[Quote]:
+        """
+        Same 24h proxy as quote(), taken from the trailing 24h of candles we already
+        hold: prevClose = first open in the window, high/low = extremes, volume = sum.
+        None when the bars don't span 24h (caller falls back to stats_24h).
+        """
+        n = max(1, 86400 // max(int(granularity), 1))
+        if len(bars) < n:
+            return None
+        return Quote(
+            symbol=product_id.upper(),
+            prevClose=float(bars.o[-n]),
+            high=float(bars.h[-n:].max()),
+            low=float(bars.l[-n:].min()),
+            volume=int(bars.v[-n:].sum()),
+            as_of=_utc_now(),
+        )
+
     async def bars(
         self,
         product_id: str,
         *,
         granularity: int = 3600,
         lookback: int = 300
-    ) -> List[Bar]:
+    ) -> BarsSoA:
         rows = await self.candles(product_id, granularity=granularity, limit=lookback)
         return self._rows_to_bars(rows)
 
@@ -141,27 +205,21 @@ class CoinbaseClient:
 # Binance Futures (derivatives): Open Interest + Funding
 # -----------------------------------------------------------------------------
 
-_BINANCE_FAPI = "https://fapi.binance.com"  # public; no key required
-
 class BinanceDerivatives:
-    def __init__(self, timeout: float = 10.0):
-        self.http = httpx.AsyncClient(
-            base_url=_BINANCE_FAPI,
-            timeout=timeout,
-            headers={"User-Agent": "discord-bot/derivs"}
-        )
-
-    async def aclose(self):
-        await self.http.aclose()
+    """Binance USDT-M perps (public; no key required): open interest + funding."""
+    def __init__(self, http: Optional[aiohttp.ClientSession] = None):
+        self.http = http or get_binance_client()
 
     async def open_interest(self, symbol_perp: str) -> Optional[OpenInterest]:
         """
         GET /fapi/v1/openInterest?symbol=BTCUSDT -> {"openInterest":"12345.6789"}
         Returns number of contracts (for USDT-M BTCUSDT, effectively base units ≈ BTC).
         """
-        r = await self.http.get("/fapi/v1/openInterest", params={"symbol": symbol_perp})
-        r.raise_for_status()
-        j = r.json()
+        return await _cached(_OI_CACHE, symbol_perp, lambda: self._open_interest(symbol_perp))
+
+    async def _open_interest(self, symbol_perp: str) -> Optional[OpenInterest]:
+        async with self.http.get("/fapi/v1/openInterest", params={"symbol": symbol_perp}) as r:
+            j = await _json(r)
         amount = float(j.get("openInterest", 0.0))
         return OpenInterest(symbol=symbol_perp, amount=amount, ts=_utc_now(), currency=None)
 
@@ -170,12 +228,14 @@ class BinanceDerivatives:
         GET /fapi/v1/premiumIndex?symbol=BTCUSDT
           -> {"lastFundingRate":"0.0001","nextFundingTime":1693910400000,...}
         """
-        r = await self.http.get("/fapi/v1/premiumIndex", params={"symbol": symbol_perp})
-        r.raise_for_status()
-        j = r.json()
+        return await _cached(_FUNDING_CACHE, symbol_perp, lambda: self._funding(symbol_perp))
+
+    async def _funding(self, symbol_perp: str) -> Optional[Funding]:
+        async with self.http.get("/fapi/v1/premiumIndex", params={"symbol": symbol_perp}) as r:
+            j = await _json(r)
         rate = float(j.get("lastFundingRate") or j.get("fundingRate") or 0.0)
         nft  = j.get("nextFundingTime")
-        return Funding(symbol=symbol_perp, rate=rate, next_funding_time=_ms_to_utc(int(nft)) if nft else None)
+        return Funding(symbol=symbol_perp, rate=rate, next_funding_time=_ms_to_utc(nft or None))  # Binance sends int ms
 
 # -----------------------------------------------------------------------------
 # CryptoPanic news (with richer fields)
@@ -187,57 +247,53 @@ class CryptoPanicNews:
     Sign up: https://cryptopanic.com/developers/api/
     Put key in .env as CRYPTOPANIC_API_KEY and ensure config.settings reads it.
     """
-    def __init__(self, api_key: Optional[str], timeout: float = 10.0):
+    def __init__(self, api_key: Optional[str], http: Optional[aiohttp.ClientSession] = None):
         self.api_key = api_key
-        self.http = httpx.AsyncClient(
-            timeout=timeout,
-            headers={"User-Agent": "discord-bot/cryptonews"}
-        )
-
-    async def aclose(self):
-        await self.http.aclose()
-
-    async def news(self, base_symbol: str, *, limit: int = 10) -> List[NewsItem]:
-        if not self.api_key:
-            return []
-
-        params = {
-            "auth_token": self.api_key,
-            "currencies": base_symbol.upper(),  # e.g., "BTC"
+        self.http = http or get_cryptopanic_client()
+        # constant query part, built once; news() only adds the currency
+        self._base_params = {
+            "auth_token": api_key,
             "public": "true",
             "filter": "hot",     # "hot" | "rising" | "important" | "all"
             "kind": "news",
             "page": 1,
         }
 
-        # Try the current developer API first, follow redirects just in case.
+    async def news(self, base_symbol: str, *, limit: int = 10) -> List[NewsItem]:
+        if not self.api_key:
+            return []
+
+        params = {**self._base_params, "currencies": base_symbol.upper()}  # e.g., "BTC"
+
+        # Try the current developer API first (aiohttp follows redirects by default).
         url = "https://cryptopanic.com/api/developer/v2/posts/"
-        r = await self.http.get(url, params=params, follow_redirects=True)
+        async with self.http.get(url, params=params) as r:
+            j = None if r.status == 404 else await _json(r)
 
         # Fallback to v1 (developer) if some keys/accounts are still on it.
-        if r.status_code == 404:
+        if j is None:
             url = "https://cryptopanic.com/api/developer/v1/posts/"
-            r = await self.http.get(url, params=params, follow_redirects=True)
-
-        r.raise_for_status()
-        j = r.json()
+            async with self.http.get(url, params=params) as r:
+                j = await _json(r)
 
         out: List[NewsItem] = []
         for item in j.get("results", [])[:limit]:
             pub = item.get("published_at")
-            dt = datetime.fromisoformat(pub.replace("Z", "+00:00")) if pub else _utc_now()
+            dt = _parse_iso(pub) if pub else _utc_now()
 
-            title = item.get("title") or (item.get("source", {}) or {}).get("title") or "(no title)"
-            url   = item.get("url") or (item.get("source", {}) or {}).get("domain") or ""
-            src   = (item.get("source", {}) or {}).get("domain", "CryptoPanic")
+            source = item.get("source") or {}
+            title = item.get("title") or source.get("title") or "(no title)"
+            url   = item.get("url") or source.get("domain") or ""
+            src   = source.get("domain", "CryptoPanic")
 
             kind = item.get("kind")
-            currs = [c.get("code") for c in (item.get("currencies") or []) if isinstance(c, dict) and c.get("code")]
+            currs = [code for c in (item.get("currencies") or []) if isinstance(c, dict) and (code := c.get("code"))]
 
             votes = item.get("votes") or {}
             liked = int(votes.get("liked") or 0)
             disliked = int(votes.get("disliked") or 0)
-            important_flag = bool(votes.get("important")) if votes.get("important") is not None else None
+            important = votes.get("important")
+            important_flag = bool(important) if important is not None else None
             score = liked - disliked
 
             out.append(
@@ -274,6 +330,7 @@ class CryptoClient:
         granularity: int = 3600,
         lookback: int = 300,
     ):
+        # providers borrow the process-wide per-host pools from intel.http_clients
         self.spot = CoinbaseClient()
         self.derivs = BinanceDerivatives()
         self.newsprov = CryptoPanicNews(api_key=cryptopanic_api_key)
@@ -281,11 +338,13 @@ class CryptoClient:
         self.lookback = lookback
 
     async def aclose(self):
-        await asyncio.gather(
-            self.spot.aclose(),
-            self.derivs.aclose(),
-            self.newsprov.aclose(),
-        )
+        """No-op: the pools are shared; bot shutdown calls http_clients.aclose_all()."""
+
+    async def __aenter__(self) -> "CryptoClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
 
     async def bundle(self, product_id: str, *, news_limit: int = 8) -> IntelBundle:
         """
@@ -294,15 +353,28 @@ class CryptoClient:
         perp = _symbol_to_binance_perp(product_id)
         base = perp.removesuffix("USDT").removesuffix("USD")  # "BTC" from "BTCUSDT"
 
-        quote_coro = self.spot.quote(product_id)
+        # the quote is derived from the candles, so Coinbase sees one request, not two
         bars_coro  = self.spot.bars(product_id, granularity=self.granularity, lookback=self.lookback)
         oi_coro    = self.derivs.open_interest(perp)
         fund_coro  = self.derivs.funding(perp)
-        news_coro  = self.newsprov.news(base, limit=news_limit)
+        news_coro  = _with_retry(lambda: self.newsprov.news(base, limit=news_limit))
 
-        quote, bars, oi, fund, news_items = await asyncio.gather(
-            quote_coro, bars_coro, oi_coro, fund_coro, news_coro
+        bars, oi, fund, news_items = await asyncio.gather(
+            bars_coro, oi_coro, fund_coro, news_coro,
+            return_exceptions=True,
         )
+        # spot bars (and so the quote) are required; derivatives/news are best-effort
+        if isinstance(bars, BaseException):
+            raise bars
+        for leg, res in (("open interest", oi), ("funding", fund), ("news", news_items)):
+            if isinstance(res, BaseException):
+                print(f"[crypto] {product_id}: {leg} unavailable ({type(res).__name__}: {res})")
+        quote = self.spot.quote_from_bars(product_id, bars, self.granularity)
+        if quote is None:  # lookback shorter than 24h of candles
+            quote = await self.spot.quote(product_id)
+        oi   = None if isinstance(oi, BaseException) else oi
+        fund = None if isinstance(fund, BaseException) else fund
+        news_items = [] if isinstance(news_items, BaseException) else news_items
 
         # Label OI with a currency hint for UI context
         if oi and oi.currency is None:
@@ -349,7 +421,7 @@ async def _smoke():
             tag = f" [{' '.join(flags)}]" if flags else ""
             print("-", n.publisher, "|", n.title, tag)
     finally:
-        await cli.aclose()
+        await aclose_all()
 
 if __name__ == "__main__":
     asyncio.run(_smoke())
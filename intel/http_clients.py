@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, Union
+
+import aiohttp
+import httpx
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Process-wide HTTP pools, one per upstream host.
+# Every cog's PolygonClient/CryptoClient borrows these, so keep-alive and TLS
+# survive cog reloads; bot.py closes them once at shutdown via aclose_all().
+# Polygon stays on httpx (HTTP/2, retry helper); the crypto fan-out in
+# CryptoClient.bundle runs on aiohttp sessions (already a discord.py dependency).
+# ──────────────────────────────────────────────────────────────────────────────
+
+_CB_BASE = "https://api.exchange.coinbase.com"
+_BINANCE_FAPI = "https://fapi.binance.com"
+
+# bundle() fans out ~6 Polygon requests per command and every cog shares this pool;
+# idle keep-alives live 30s so bursts of commands reuse the warm connection.
+_POLYGON_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=30.0)
+
+# Per-phase timeouts: a dead host fails on connect within 2s instead of holding a
+# command for the whole budget; read allowances follow payload size per endpoint.
+_POLYGON_TIMEOUT = httpx.Timeout(connect=2.0, read=10.0, write=2.0, pool=2.0)
+_COINBASE_TIMEOUT = aiohttp.ClientTimeout(total=12, connect=2, sock_connect=2, sock_read=8)
+_BINANCE_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=2, sock_connect=2, sock_read=5)
+_CRYPTOPANIC_TIMEOUT = aiohttp.ClientTimeout(total=12, connect=2, sock_connect=2, sock_read=10)
+
+_CLIENTS: Dict[str, Union[httpx.AsyncClient, aiohttp.ClientSession]] = {}
+
+
+def _is_closed(client) -> bool:
+    return client.is_closed if isinstance(client, httpx.AsyncClient) else client.closed
+
+
+def get_polygon_client() -> httpx.AsyncClient:
+    # Construction never awaits, so check-then-set can't interleave on the loop.
+    client = _CLIENTS.get("polygon")
+    if client is None or _is_closed(client):
+        client = _CLIENTS["polygon"] = httpx.AsyncClient(http2=True, limits=_POLYGON_LIMITS, timeout=_POLYGON_TIMEOUT)
+    return client
+
+
+def _session(name: str, user_agent: str, *, timeout: aiohttp.ClientTimeout,
+             base_url: str | None = None) -> aiohttp.ClientSession:
+    """Shared aiohttp session; must first be requested from inside the running loop."""
+    session = _CLIENTS.get(name)
+    if session is None or _is_closed(session):
+        session = _CLIENTS[name] = aiohttp.ClientSession(
+            base_url=base_url,
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300),
+            timeout=timeout,
+            headers={"User-Agent": user_agent},
+        )
+    return session
+
+
+def get_coinbase_client() -> aiohttp.ClientSession:
+    return _session("coinbase", "discord-bot/crypto-intel", timeout=_COINBASE_TIMEOUT, base_url=_CB_BASE)
+
+
+def get_binance_client() -> aiohttp.ClientSession:
+    return _session("binance", "discord-bot/derivs", timeout=_BINANCE_TIMEOUT, base_url=_BINANCE_FAPI)
+
+
+def get_cryptopanic_client() -> aiohttp.ClientSession:
+    return _session("cryptopanic", "discord-bot/cryptonews", timeout=_CRYPTOPANIC_TIMEOUT)
+
+
+async def _close(name: str, client) -> None:
+    # one pool failing to close must not cancel its siblings in the TaskGroup
+    try:
+        await (client.aclose() if isinstance(client, httpx.AsyncClient) else client.close())
+    except Exception as e:
+        print(f"[http] closing {name} pool failed: {e!r}")
+
+
+async def aclose_all() -> None:
+    """Close every shared pool (bot shutdown / end of a smoke test)."""
+    clients = list(_CLIENTS.items())
+    _CLIENTS.clear()
+    async with asyncio.TaskGroup() as tg:
+        for name, client in clients:
+            tg.create_task(_close(name, client))
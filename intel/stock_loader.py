@@ -33,20 +33,23 @@ Usage
 2. Or call methods individually:
     - `await pg.prev_close("AAPL")` → dict with yesterday's OHLC + volume
     - `await pg.aggregates("AAPL", 1, "day", "2024-01-01", "2024-03-01")`
-         → list of OHLCV bars for the given date range
+         → BarsSoA (columnar OHLCV arrays) for the given date range
     - `await pg.news("AAPL", limit=5)` → list of NewsItem dataclasses
     - `await pg.bundle("AAPL", bars_timespan="week", bars_lookback=52)`
          → IntelBundle with Quote, Bars, News
+    - `await pg.bundle_many(["AAPL", "MSFT"], bars_timespan="day")`
+         → list of IntelBundle, fetched concurrently
 
 3. What you get back:
     - `Quote`: prevClose, high, low, volume, as_of timestamp
-    - `Bar`:   t (ms), o, h, l, c, v (candlestick data)
+    - `BarsSoA`: columnar t (ms), o, h, l, c, v arrays; indexing yields `Bar`
     - `NewsItem`: publisher, title, url, published_at
     - `IntelBundle`: wrapper holding all of the above
 
 Notes
 -----
-- Always `await pg.aclose()` when done to close the HTTP session.
+- The HTTP session is shared process-wide; `await intel.http_clients.aclose_all()`
+  once at shutdown closes it (`pg.aclose()` is kept as a no-op).
 - Timespans supported: "minute", "hour", "day", "week", "month".
 - For charting or indicators, use a separate package (e.g. `charts/`).
 """
@@ -54,14 +57,29 @@ Notes
 from __future__ import annotations
 
 import asyncio
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Protocol
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 import httpx
+import numpy as np
+import orjson
+import pandas as pd
 
+try:  # optional: stream-parse large aggregates instead of buffering the body
+    import ijson
+except ImportError:
+    ijson = None
+
+from cache import TTLCache, SingleFlight
 from config import settings
+from .http_clients import get_polygon_client, aclose_all
 from .contract import (
-    Quote, Bar, NewsItem, Dividend, Split, Earnings, IntelBundle,
+    Quote, BarsSoA, NewsItem, Dividend, Split, Earnings, IntelBundle,
     # ---- options (make sure these exist in contract.py) ----
     OptionContract, OptionQuote, OptionSnapshot, OptionChain,
 )
@@ -71,6 +89,8 @@ from .contract import (
 # =============================================================================
 
 _BASE = "https://api.polygon.io"
+_NEWS_URL = f"{_BASE}/v2/reference/news"
+_AGGS_URL = f"{_BASE}/v2/aggs/ticker"  # + /{SYM}/prev or /{SYM}/range/...
 _API_KEY = settings.POLYGON_API_KEY
 
 
@@ -78,14 +98,35 @@ _API_KEY = settings.POLYGON_API_KEY
 # Helpers
 # =============================================================================
 
+def _fast_iso(s: str) -> Optional[datetime]:
+    """Slice-parse the two shapes Polygon sends: 'YYYY-MM-DD' and 'YYYY-MM-DDTHH:MM:SSZ'.
+    None for anything else, so the caller takes the general path."""
+    n = len(s)
+    if s[4:5] != "-" or s[7:8] != "-":
+        return None
+    try:
+        if n == 10:
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), tzinfo=timezone.utc)
+        if n == 20 and s[10] == "T" and s[19] == "Z":
+            return datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                            int(s[11:13]), int(s[14:16]), int(s[17:19]), tzinfo=timezone.utc)
+    except ValueError:
+        pass
+    return None
+
+
+# Corporate-action dates repeat across rows and pages; datetimes are immutable,
+# so sharing one parsed object per string is safe.
+@lru_cache(maxsize=4096)
 def _parse_iso_utc(s: Optional[str]) -> Optional[datetime]:
     if not s:
         return None
-    s = s.strip()
-    if s.endswith("Z"):
-        s = s[:-1] + "+00:00"
+    dt = _fast_iso(s)
+    if dt is not None:
+        return dt
     try:
-        dt = datetime.fromisoformat(s)
+        # 3.11+ (already required for asyncio.TaskGroup) accepts a trailing "Z" natively
+        dt = datetime.fromisoformat(s.strip())
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
         return dt.astimezone(timezone.utc)
@@ -99,6 +140,92 @@ def _epoch_ms_to_utc(ms: Optional[int]) -> Optional[datetime]:
     return datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
 
 
+# Negative cache: (endpoint, symbol, params) that just came back with no results.
+# Polling the same empty range/feed again within the window returns [] locally.
+_EMPTY_TTL = 60.0
+_EMPTY = TTLCache(maxsize=1024, ttl=_EMPTY_TTL)
+
+
+# Positive caches. prev_close is keyed on the UTC day so it rolls over by itself;
+# aggregates ranges that end before today are history and never change, ranges
+# reaching today hold the still-forming bar, so they only live a few seconds.
+_PREV_CLOSE = TTLCache(maxsize=512, ttl=3600)
+_AGGS = TTLCache(maxsize=256, ttl=3600)
+_AGGS_LIVE_TTL = 30.0
+# Corporate actions are announced days ahead; splits change even more rarely.
+# An empty history is cached like any other answer.
+_DIVIDENDS = TTLCache(maxsize=512, ttl=3600)
+_SPLITS = TTLCache(maxsize=512, ttl=86400)
+_INFLIGHT = SingleFlight()
+
+
+async def _memo(cache: TTLCache, key, factory, ttl: Optional[float] = None):
+    """cache hit, else one shared fetch per key (concurrent misses coalesce)."""
+    hit = cache.get(key)
+    if hit is not None:
+        return hit
+
+    async def _load():
+        value = await factory()
+        cache.set(key, value, ttl=ttl)
+        return value
+
+    return await _INFLIGHT.do((id(cache), key), _load)
+
+
+class _AsyncBody:
+    """Adapt a streamed httpx response to the async read() ijson consumes."""
+
+    def __init__(self, r: httpx.Response):
+        self._chunks = r.aiter_bytes()
+
+    async def read(self, n: int = -1) -> bytes:
+        return await anext(self._chunks, b"")
+
+
+async def _stream_bars(r: httpx.Response, limit: int) -> BarsSoA:
+    """Fill a (limit, 6) buffer straight from `results.item` as bytes arrive:
+    neither the whole body nor the list of per-bar dicts is ever held."""
+    buf = np.empty((limit, 6), dtype=np.float64)
+    i = 0
+    async for b in ijson.items(_AsyncBody(r), "results.item", use_float=True):
+        if i == limit:
+            break
+        buf[i] = (b["t"], b["o"], b["h"], b["l"], b["c"], b["v"])
+        i += 1
+    return BarsSoA.from_rows(buf[:i])
+
+
+class _TokenBucket:
+    """Async token bucket shared by every Polygon request: bundle() fan-outs from
+    all cogs queue for tokens instead of bursting into a synchronized 429 storm."""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:  # POLYGON_RPS=0 disables limiting (paid plans)
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+_POLYGON_RPS = float(os.getenv("POLYGON_RPS", "5"))
+_LIMITER = _TokenBucket(_POLYGON_RPS, burst=_POLYGON_RPS)
+_MAX_BACKOFF = 30.0
+
+
 async def _request_with_retry(
     http: httpx.AsyncClient,
     method: str,
@@ -106,46 +233,82 @@ async def _request_with_retry(
     *,
     params: Dict[str, Any] | None = None,
     max_retries: int = 3,
+    stream: bool = False,
 ) -> httpx.Response:
-    tries = 0
-    params = dict(params or {})
-    params.setdefault("apiKey", _API_KEY)
-
-    while True:
-        r = await http.request(method, url, params=params)
+    """
+    stream=True hands back a successful response with its body unread; the caller
+    consumes it (aiter_bytes) and must aclose() it. Error bodies are always read.
+    Identical buffered GETs already in flight share one response.
+    """
+    if params is None or "apiKey" not in params:  # copy only when the key must be added
+        params = {**(params or {}), "apiKey": _API_KEY}
+    if stream or method != "GET":  # a streamed body can only be consumed once
+        return await _send_with_retry(http, method, url, params, max_retries, stream)
+    key = ("http", url, tuple(sorted(params.items())))
+    return await _INFLIGHT.do(key, lambda: _send_with_retry(http, method, url, params, max_retries, False))
 
-        if r.status_code in (401, 403):
-            raise RuntimeError(f"Polygon auth/permission error {r.status_code}: {r.text}")
 
-        if r.status_code == 429:  # rate limited
+async def _send_with_retry(
+    http: httpx.AsyncClient,
+    method: str,
+    url: str,
+    params: Dict[str, Any],
+    max_retries: int,
+    stream: bool,
+) -> httpx.Response:
+    tries = 0
+    while True:
+        await _LIMITER.acquire()
+        r = await http.send(http.build_request(method, url, params=params), stream=stream)
+        status = r.status_code
+        if 200 <= status < 300:  # happy path: one chained compare, straight out
+            return r
+        if stream:
+            await r.aread()
+
+        if status == 401 or status == 403:
+            raise RuntimeError(f"Polygon auth/permission error {status}: {r.text}")
+
+        if status == 429:  # rate limited
             tries += 1
             if tries > max_retries:
                 raise RuntimeError("Polygon rate limited (429) after retries.")
-            retry_after = float(r.headers.get("Retry-After", tries * 1.5))
-            await asyncio.sleep(retry_after)
+            ra = r.headers.get("Retry-After")
+            try:
+                retry_after = float(ra) if ra else tries * 1.5
+            except ValueError:  # HTTP-date form
+                retry_after = tries * 1.5
+            # decorrelated jitter: concurrent retries spread out instead of re-colliding
+            await asyncio.sleep(min(_MAX_BACKOFF, random.uniform(retry_after, retry_after * 3 + tries ** 2)))
             continue
 
-        if r.status_code >= 500:  # server error
+        if status >= 500:  # server error
             tries += 1
             if tries > max_retries:
                 r.raise_for_status()
-            await asyncio.sleep(1.0 * tries)
+            await asyncio.sleep(min(_MAX_BACKOFF, random.uniform(0.5, 1.5) * 2 ** (tries - 1)))
             continue
 
         r.raise_for_status()
         return r
 
 
+async def _empty_list() -> list:
+    return []
+
+
+# lookback unit per bar timespan; anything else (hour/minute) counts back in days
+_LOOKBACK_UNIT = {"day": timedelta(days=1), "week": timedelta(weeks=1), "month": timedelta(days=30)}
+
+
 def _default_range(timespan: str, lookback: int) -> tuple[str, str]:
-    end_dt = datetime.now(timezone.utc).date()
-    if timespan == "day":
-        start_dt = end_dt - timedelta(days=lookback)
-    elif timespan == "week":
-        start_dt = end_dt - timedelta(weeks=lookback)
-    elif timespan == "month":
-        start_dt = end_dt - timedelta(days=30 * lookback)
-    else:
-        start_dt = end_dt - timedelta(days=lookback)
+    return _range_for(timespan, lookback, datetime.now(timezone.utc).date())
+
+
+@lru_cache(maxsize=64)
+def _range_for(timespan: str, lookback: int, end_dt: date) -> tuple[str, str]:
+    # keyed on today's date, so the ISO strings roll over at UTC midnight
+    start_dt = end_dt - _LOOKBACK_UNIT.get(timespan, _LOOKBACK_UNIT["day"]) * lookback
     return (start_dt.isoformat(), end_dt.isoformat())
 
 
@@ -173,72 +336,127 @@ class PolygonEventsProvider(EventsPort):
     Uses Polygon reference endpoints for dividends/splits.
     Earnings left empty (you can add another provider if needed).
     """
-    def __init__(self, http: httpx.AsyncClient, *, base: str = "https://api.polygon.io"):
-        self.http = http
+    def __init__(self, http: Optional[httpx.AsyncClient] = None, *, base: str = _BASE):
+        # same process-wide pool as PolygonClient, so events reuse its keep-alive
+        self.http = http or get_polygon_client()
         self.base = base
 
+    async def _pages(self, url: str, symbol: str, limit: int):
+        """
+        Yield result pages for a cursor-paginated reference endpoint. Cursors are
+        sequential (each comes from the previous page), so the best we can do is
+        pipeline: the next page is requested before the current one is parsed.
+        """
+        params: Dict[str, Any] = {"ticker": symbol.upper(), "limit": min(limit, 1000)}
+        pending = asyncio.ensure_future(_request_with_retry(self.http, "GET", url, params=params))
+        seen = 0
+        try:
+            while pending is not None:
+                j = orjson.loads((await pending).content)
+                pending = None
+                results = j.get("results", [])
+                seen += len(results)
+                # next_url is a full URL carrying the cursor; httpx merges apiKey in
+                next_url = j.get("next_url")
+                if next_url and results and seen < limit:
+                    pending = asyncio.ensure_future(_request_with_retry(self.http, "GET", next_url))
+                yield results
+        finally:
+            if pending is not None:
+                pending.cancel()
+
     async def dividends(self, symbol: str, *, limit: int = 50) -> List[Dividend]:
+        sym = symbol.upper()
+        return await _memo(_DIVIDENDS, (self.base, sym, limit), lambda: self._dividends(sym, limit))
+
+    async def _dividends(self, symbol: str, limit: int) -> List[Dividend]:
         url = f"{self.base}/v3/reference/dividends"
         out: List[Dividend] = []
-        cursor: Optional[str] = None
+        append, parse = out.append, _parse_iso_utc  # hoisted out of the row loop
 
-        while True:
-            params = {"ticker": symbol.upper(), "limit": min(limit, 1000)}
-            if cursor:
-                params["cursor"] = cursor
-            r = await _request_with_retry(self.http, "GET", url, params=params)
-            j = r.json()
-
-            for d in j.get("results", []):
-                out.append(
+        async for page in self._pages(url, symbol, limit):
+            for d in page[:limit - len(out)]:  # stop parsing at the cap
+                get = d.get
+                append(
                     Dividend(
-                        cash_amount=float(d.get("cash_amount", 0.0)),
-                        declaration_date=_parse_iso_utc(d.get("declaration_date")),
-                        ex_dividend_date=_parse_iso_utc(d.get("ex_dividend_date")),
-                        payment_date=_parse_iso_utc(d.get("pay_date")),
-                        record_date=_parse_iso_utc(d.get("record_date")),
-                        frequency=d.get("frequency"),
+                        cash_amount=float(d["cash_amount"]) if "cash_amount" in d else 0.0,
+                        declaration_date=parse(get("declaration_date")),
+                        ex_dividend_date=parse(get("ex_dividend_date")),
+                        payment_date=parse(get("pay_date")),
+                        record_date=parse(get("record_date")),
+                        frequency=get("frequency"),
                     )
                 )
-
-            cursor = j.get("next_url") or j.get("next_url_cursor") or j.get("next")
-            if not cursor or len(out) >= limit:
-                break
-
-        return out[:limit]
+        return out
 
     async def splits(self, symbol: str, *, limit: int = 50) -> List[Split]:
+        sym = symbol.upper()
+        return await _memo(_SPLITS, (self.base, sym, limit), lambda: self._splits(sym, limit))
+
+    async def _splits(self, symbol: str, limit: int) -> List[Split]:
         url = f"{self.base}/v3/reference/splits"
         out: List[Split] = []
-        cursor: Optional[str] = None
+        append, parse = out.append, _parse_iso_utc
+
+        async for page in self._pages(url, symbol, limit):
+            for s in page[:limit - len(out)]:  # stop parsing at the cap
+                get = s.get
+                split_from, split_to = get("split_from"), get("split_to")
+                if split_from and split_to:
+                    ratio = f"{split_from}/{split_to}"
+                else:
+                    ratio = get("ratio") or "1/1"
+                append(Split(ratio=ratio, execution_date=parse(get("execution_date"))))
+        return out
 
-        while True:
-            params = {"ticker": symbol.upper(), "limit": min(limit, 1000)}
-            if cursor:
-                params["cursor"] = cursor
-            r = await _request_with_retry(self.http, "GET", url, params=params)
-            j = r.json()
+    async def earnings(self, symbol: str, *, limit: int = 12) -> List[Earnings]:
+        return []  # keep open for an alternative provider later
 
-            for s in j.get("results", []):
-                if s.get("split_from") and s.get("split_to"):
-                    ratio = f"{s.get('split_from')}/{s.get('split_to')}"
-                else:
-                    ratio = s.get("ratio") or "1/1"
-                out.append(Split(ratio=ratio, execution_date=_parse_iso_utc(s.get("execution_date"))))
 
-            cursor = j.get("next_url") or j.get("next_url_cursor") or j.get("next")
-            if not cursor or len(out) >= limit:
-                break
+# One yf.Ticker per symbol for a while: it memoizes its price history (shared by
+# dividends + splits) and option expirations (needed again by option_chain).
+_YF_TICKERS = TTLCache(maxsize=128, ttl=900)
 
-        return out[:limit]
+def _yf_ticker(yf, symbol: str):
+    symbol = symbol.upper()  # "aapl" and "AAPL" share one Ticker
+    tkr = _YF_TICKERS.get(symbol)
+    if tkr is None:
+        tkr = yf.Ticker(symbol)
+        _YF_TICKERS.set(symbol, tkr)
+    return tkr
 
-    async def earnings(self, symbol: str, *, limit: int = 12) -> List[Earnings]:
-        return []  # keep open for an alternative provider later
+
+# yfinance gets its own workers so a slow Yahoo call can't starve asyncio's default
+# executor; threads (not processes) so the cached Ticker objects above are shared.
+_YF_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="yfinance")
+
+async def _in_yf_pool(fn):
+    return await asyncio.get_running_loop().run_in_executor(_YF_POOL, fn)
+
+
+def _utc_datetimes(idx) -> List[datetime]:
+    """DatetimeIndex -> aware UTC datetimes with one vectorised tz op (naive = UTC)."""
+    idx = idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+    return idx.to_pydatetime().tolist()
+
+
+def _format_ratio(x: Optional[float]) -> str:
+    """yfinance split factor (2.0, 0.25, ...) -> 'n/1' or '1/n'."""
+    if x is None:
+        return "1/1"
+    try:
+        r = float(x)
+    except Exception:
+        return str(x)
+    if r >= 1:
+        return f"{int(r)}/1" if r.is_integer() else f"{r}/1"
+    inv = 1.0 / r
+    return f"1/{int(inv)}" if inv.is_integer() else f"1/{inv}"
 
 
 class YFinanceEventsProvider(EventsPort):
     """
-    yfinance-based events (no key). Uses background threads so we remain async.
+    yfinance-based events (no key). Runs in the _YF_POOL threads so we remain async.
     """
     def __init__(self):
         import yfinance as yf
@@ -246,18 +464,17 @@ class YFinanceEventsProvider(EventsPort):
 
     async def dividends(self, symbol: str, *, limit: int = 50) -> List[Dividend]:
         def _fetch() -> List[Dividend]:
-            tkr = self.yf.Ticker(symbol)
+            tkr = _yf_ticker(self.yf, symbol)
             s = getattr(tkr, "dividends", None)
             if s is None or getattr(s, "empty", True):
                 return []
+            s = s.tail(limit)
+            cash_arr = s.to_numpy(dtype="float64", na_value=0.0).tolist()
             out: List[Dividend] = []
-            for dt, cash in list(s.items())[-limit:]:
-                ts = dt.to_pydatetime()
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=timezone.utc)
+            for ts, cash in zip(_utc_datetimes(s.index), cash_arr):
                 out.append(
                     Dividend(
-                        cash_amount=float(cash) if cash is not None else 0.0,
+                        cash_amount=cash,
                         declaration_date=None,
                         ex_dividend_date=ts,   # best-effort mapping
                         payment_date=None,
@@ -266,38 +483,25 @@ class YFinanceEventsProvider(EventsPort):
                     )
                 )
             return out
-        return await asyncio.to_thread(_fetch)
+        return await _in_yf_pool(_fetch)
 
     async def splits(self, symbol: str, *, limit: int = 50) -> List[Split]:
-        def _format_ratio(x: Optional[float]) -> str:
-            if x is None:
-                return "1/1"
-            try:
-                r = float(x)
-            except Exception:
-                return str(x)
-            if r >= 1:
-                return f"{int(r)}/1" if r.is_integer() else f"{r}/1"
-            inv = 1.0 / r
-            return f"1/{int(inv)}" if inv.is_integer() else f"1/{inv}"
-
         def _fetch() -> List[Split]:
-            tkr = self.yf.Ticker(symbol)
+            tkr = _yf_ticker(self.yf, symbol)
             s = getattr(tkr, "splits", None)
             if s is None or getattr(s, "empty", True):
                 return []
-            out: List[Split] = []
-            for dt, ratio in list(s.items())[-limit:]:
-                ts = dt.to_pydatetime()
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=timezone.utc)
-                out.append(Split(ratio=_format_ratio(ratio), execution_date=ts))
-            return out
-        return await asyncio.to_thread(_fetch)
+            s = s.tail(limit)
+            ratios = s.to_numpy(dtype="float64", na_value=np.nan).tolist()
+            return [
+                Split(ratio=_format_ratio(None if r != r else r), execution_date=ts)  # NaN -> None
+                for ts, r in zip(_utc_datetimes(s.index), ratios)
+            ]
+        return await _in_yf_pool(_fetch)
 
     async def earnings(self, symbol: str, *, limit: int = 12) -> List[Earnings]:
         def _fetch() -> List[Earnings]:
-            tkr = self.yf.Ticker(symbol)
+            tkr = _yf_ticker(self.yf, symbol)
             try:
                 df = tkr.get_earnings_dates(limit=limit)
             except Exception:
@@ -305,40 +509,54 @@ class YFinanceEventsProvider(EventsPort):
             if df is None or df.empty:
                 return []
 
+            # yfinance renames these between releases: resolve each column once
+            cols = {str(c).lower().replace(" ", "").replace(".", ""): c for c in df.columns}
+            eps_col = cols.get("reportedeps") or cols.get("epsactual")
+            est_col = cols.get("epsestimate") or cols.get("epsest")
+            date_col = cols.get("earningsdate") or cols.get("date")
+
+            df = df.iloc[:limit]
+            n = len(df)
+            # one vectorised parse each: strings/naive/exchange-local -> UTC, junk -> NaT/NaN
+            when = pd.to_datetime(df.index if date_col is None else df[date_col], utc=True, errors="coerce")
+            # 'datetime64[ns]' drops the (UTC) tz; microsecond tolist() yields datetimes, NaT -> None
+            dates = when.to_numpy(dtype="datetime64[ns]").astype("datetime64[us]").tolist()
+
+            def _nums(col):
+                if col is None:
+                    return np.full(n, np.nan)
+                return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+            eps_arr, est_arr = _nums(eps_col), _nums(est_col)
+
             out: List[Earnings] = []
-            rows = df.reset_index().to_dict("records")
-            for row in rows[:limit]:
-                dt = row.get("Earnings Date") or row.get("Date") or row.get("index")
-                rpt = None
-                if hasattr(dt, "to_pydatetime"):
-                    rpt = dt.to_pydatetime()
-                elif isinstance(dt, datetime):
-                    rpt = dt
-                if rpt is not None and rpt.tzinfo is None:
-                    rpt = rpt.replace(tzinfo=timezone.utc)
-
-                eps_act = row.get("Reported EPS") or row.get("EPS Actual") or row.get("ReportedEPS")
-                eps_est = row.get("EPS Estimate") or row.get("EPS Est.") or row.get("EPSEstimate")
-                eps = float(eps_act) if eps_act is not None else None
-                consensus = float(eps_est) if eps_est is not None else None
+            for dt, a, e in zip(dates, eps_arr.tolist(), est_arr.tolist()):
+                eps = None if a != a else a  # NaN -> None
+                consensus = None if e != e else e
                 surprise_abs = (eps - consensus) if (eps is not None and consensus is not None) else None
-
                 out.append(Earnings(
                     fiscal_period=None,
                     eps=eps,
                     consensus_eps=consensus,
-                    report_date=rpt,
+                    report_date=dt.replace(tzinfo=timezone.utc) if dt is not None else None,
                     surprise=surprise_abs,
                     revenue=None,
                 ))
             return out
-        return await asyncio.to_thread(_fetch)
+        return await _in_yf_pool(_fetch)
 
 
 # =============================================================================
 # Options provider (yfinance for now; Polygon later)
 # =============================================================================
 
+# Listed expirations only change when new series are added; a chain's quotes move
+# fastest near expiry, so near-dated chains (<= 7 days out) live a minute, the rest 15.
+_EXPIRATIONS = TTLCache(maxsize=256, ttl=3600)
+_CHAINS = TTLCache(maxsize=256, ttl=900)
+_CHAIN_NEAR_TTL = 60.0
+
+
 class YFinanceOptionsProvider(OptionsPort):
     """
     Options via yfinance. Converts DataFrames -> dataclasses in a thread.
@@ -349,7 +567,7 @@ class YFinanceOptionsProvider(OptionsPort):
 
     async def expirations(self, symbol: str) -> List[datetime]:
         def _fetch() -> List[datetime]:
-            tkr = self.yf.Ticker(symbol)
+            tkr = _yf_ticker(self.yf, symbol)
             exps = getattr(tkr, "options", []) or []
             out: List[datetime] = []
             for s in exps:
@@ -360,66 +578,73 @@ class YFinanceOptionsProvider(OptionsPort):
                     continue
             out.sort()
             return out
-        return await asyncio.to_thread(_fetch)
+        return await _memo(_EXPIRATIONS, symbol.upper(), lambda: _in_yf_pool(_fetch))
 
     async def chain(self, symbol: str, expiration: datetime) -> OptionChain:
         def _fetch() -> OptionChain:
-            tkr = self.yf.Ticker(symbol)
+            tkr = _yf_ticker(self.yf, symbol)
             date_str = expiration.date().isoformat()
             ch = tkr.option_chain(date_str)  # NamedTuple(calls=DataFrame, puts=DataFrame)
 
-            def _f(x):
-                try:
-                    return float(x) if x is not None else None
-                except Exception:
-                    return None
+            underlying_sym = symbol.upper()
+            exp_naive = expiration.replace(tzinfo=None)
 
-            def _i(x):
-                try:
-                    return int(x) if x is not None else None
-                except Exception:
-                    return None
+            def _numeric(df, col: str) -> np.ndarray:
+                # vectorised coerce: junk strings become NaN instead of raising mid-chain
+                return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+            def _floats(df, col: str, *, as_int: bool = False) -> list:
+                # whole column at once; missing column / NaN -> None
+                if col not in df.columns:
+                    return [None] * len(df)
+                vals = _numeric(df, col).tolist()
+                if as_int:
+                    return [None if x != x else int(x) for x in vals]
+                return [None if x != x else x for x in vals]
 
             def rows_to_snapshots(df, right_letter: str) -> List[OptionSnapshot]:
-                if df is None or getattr(df, "empty", True):
+                if df is None or getattr(df, "empty", True) or "strike" not in df.columns:
                     return []
-                records = df.to_dict("records")
-                out: List[OptionSnapshot] = []
-                for r in records:
-                    try:
-                        cs = str(r.get("contractSymbol") or "")
-                        strike = float(r.get("strike"))
-                        itm = bool(r.get("inTheMoney"))
-                        last  = _f(r.get("lastPrice"))
-                        bid   = _f(r.get("bid"))
-                        ask   = _f(r.get("ask"))
-                        vol   = _i(r.get("volume"))
-                        oi    = _i(r.get("openInterest"))
-                        iv    = _f(r.get("impliedVolatility"))
-
-                        contract = OptionContract(
-                            contract_symbol=cs,
-                            underlying= symbol.upper(),
-                            right= right_letter,
-                            strike= strike,
-                            expiration= expiration.replace(tzinfo=None),
-                            in_the_money= itm,
-                        )
-                        quote = OptionQuote(
+                # sort by strike in numpy, dropping rows without one
+                strikes = _numeric(df, "strike")
+                order = np.argsort(strikes, kind="stable")
+                order = order[~np.isnan(strikes[order])]
+                df = df.iloc[order]
+
+                n = len(df)
+                cs = df["contractSymbol"].fillna("").astype(str).tolist() if "contractSymbol" in df.columns else [""] * n
+                itm = df["inTheMoney"].fillna(False).astype(bool).tolist() if "inTheMoney" in df.columns else [False] * n
+                cols = (
+                    _floats(df, "lastPrice"), _floats(df, "bid"), _floats(df, "ask"),
+                    _floats(df, "volume", as_int=True), _floats(df, "openInterest", as_int=True),
+                    _floats(df, "impliedVolatility"),
+                )
+                return [
+                    OptionSnapshot(
+                        contract=OptionContract(
+                            contract_symbol=c,
+                            underlying=underlying_sym,
+                            right=right_letter,
+                            strike=k,
+                            expiration=exp_naive,
+                            in_the_money=m,
+                        ),
+                        quote=OptionQuote(
                             last=last, bid=bid, ask=ask,
-                            volume=vol, open_interest=oi, implied_vol=iv
-                        )
-                        out.append(OptionSnapshot(contract=contract, quote=quote))
-                    except Exception:
-                        continue
-                out.sort(key=lambda s: s.contract.strike)
-                return out
+                            volume=vol, open_interest=oi, implied_vol=iv,
+                        ),
+                    )
+                    for c, k, m, last, bid, ask, vol, oi, iv in zip(cs, strikes[order].tolist(), itm, *cols)
+                ]
 
             calls = rows_to_snapshots(ch.calls, "C")
             puts  = rows_to_snapshots(ch.puts,  "P")
-            return OptionChain(underlying=symbol.upper(), expiration=expiration, calls=calls, puts=puts)
+            return OptionChain(underlying=underlying_sym, expiration=expiration, calls=calls, puts=puts)
 
-        return await asyncio.to_thread(_fetch)
+        key = (symbol.upper(), expiration.date().isoformat())
+        days_out = (expiration.date() - datetime.now(timezone.utc).date()).days
+        ttl = _CHAIN_NEAR_TTL if days_out <= 7 else None
+        return await _memo(_CHAINS, key, lambda: _in_yf_pool(_fetch), ttl=ttl)
 
 
 # =============================================================================
@@ -435,27 +660,40 @@ class PolygonClient:
 
     def __init__(
         self,
-        timeout: float = 15.0,
         events_provider: Optional[EventsPort] = None,
         options_provider: Optional[OptionsPort] = None,
+        http: Optional[httpx.AsyncClient] = None,
     ):
         if not _API_KEY:
             raise RuntimeError("POLYGON_API_KEY missing in environment/.env")
-        self.http = httpx.AsyncClient(timeout=timeout)
+        # process-wide pool (intel.http_clients): keep-alive survives cog reloads
+        self.http = http or get_polygon_client()
         self.events: EventsPort = events_provider or YFinanceEventsProvider()
         self.options: OptionsPort = options_provider or YFinanceOptionsProvider()
 
     async def aclose(self):
-        await self.http.aclose()
+        """No-op: the pool is shared; bot shutdown calls http_clients.aclose_all()."""
+
+    async def warmup(self) -> None:
+        """Open the pooled connection (TCP+TLS) ahead of the first command; best-effort."""
+        try:
+            await self.http.head(_BASE)
+        except httpx.HTTPError:
+            pass
 
     # ---------- core polygon ----------
 
     async def prev_close(self, symbol: str, adjusted: bool = True) -> Dict[str, Any]:
-        url = f"{_BASE}/v2/aggs/ticker/{symbol.upper()}/prev"
+        day = datetime.now(timezone.utc).date().toordinal()
+        sym = symbol.upper()
+        return await _memo(_PREV_CLOSE, (sym, adjusted, day), lambda: self._prev_close(sym, adjusted))
+
+    async def _prev_close(self, symbol: str, adjusted: bool) -> Dict[str, Any]:
+        url = f"{_AGGS_URL}/{symbol}/prev"
         r = await _request_with_retry(
             self.http, "GET", url, params={"adjusted": str(adjusted).lower()}
         )
-        data = r.json()
+        data = orjson.loads(r.content)
         if not data.get("results"):
             raise RuntimeError(f"No prev data for {symbol}")
         return data["results"][0]
@@ -469,43 +707,64 @@ class PolygonClient:
         end: str,
         adjusted: bool = True,
         limit: int = 50000,
-    ) -> List[Dict[str, Any]]:
-        url = f"{_BASE}/v2/aggs/ticker/{symbol.upper()}/range/{multiplier}/{timespan}/{start}/{end}"
-        r = await _request_with_retry(
-            self.http,
-            "GET",
-            url,
-            params={"adjusted": str(adjusted).lower(), "limit": limit},
+    ) -> BarsSoA:
+        sym = symbol.upper()
+        key = ("aggs", sym, multiplier, timespan, start, end, adjusted, limit)
+        if _EMPTY.get(key):
+            return BarsSoA.from_rows(())
+        url = f"{_AGGS_URL}/{sym}/range/{multiplier}/{timespan}/{start}/{end}"
+        live = end >= datetime.now(timezone.utc).date().isoformat()
+        results = await _memo(
+            _AGGS, key,
+            lambda: self._aggregates(url, adjusted, limit),
+            ttl=_AGGS_LIVE_TTL if live else None,
         )
-        return r.json().get("results", [])
+        if not results:
+            _EMPTY.set(key, True)
+        return results
+
+    async def _aggregates(self, url: str, adjusted: bool, limit: int) -> BarsSoA:
+        params = {"adjusted": str(adjusted).lower(), "limit": limit}
+        if ijson is None:
+            r = await _request_with_retry(self.http, "GET", url, params=params)
+            return BarsSoA.from_records(orjson.loads(r.content).get("results") or [])
+        r = await _request_with_retry(self.http, "GET", url, params=params, stream=True)
+        try:
+            return await _stream_bars(r, limit)
+        finally:
+            await r.aclose()
 
     async def news(self, symbol: str, limit: int = 8) -> list[NewsItem]:
-        url = f"{_BASE}/v2/reference/news"
+        sym = symbol.upper()
+        key = ("news", sym, limit)
+        if _EMPTY.get(key):
+            return []
         r = await _request_with_retry(
             self.http,
             "GET",
-            url,
+            _NEWS_URL,
             params={
-                "ticker": symbol.upper(),
+                "ticker": sym,
                 "limit": limit,
                 "order": "desc",
                 "sort": "published_utc",
             },
         )
-        j = r.json()
+        results = orjson.loads(r.content).get("results") or []
+        if not results:
+            _EMPTY.set(key, True)
         items: list[NewsItem] = []
-        for n in j.get("results", []):
-            published_raw = n.get("published_utc")
-            published_at = (
-                datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
-                if published_raw else datetime.now(timezone.utc)
-            )
-            items.append(
+        append, parse = items.append, _parse_iso_utc
+        now = datetime.now(timezone.utc)  # fallback stamp, taken once per response
+        for n in results:
+            get = n.get
+            pub = get("publisher")
+            append(
                 NewsItem(
-                    publisher=(n.get("publisher", {}) or {}).get("name", "Unknown"),
-                    title=n.get("title", "(no title)"),
-                    url=n.get("article_url", ""),
-                    published_at=published_at,
+                    publisher=pub.get("name", "Unknown") if pub else "Unknown",
+                    title=get("title", "(no title)"),
+                    url=get("article_url", ""),
+                    published_at=parse(get("published_utc")) or now,
                 )
             )
         return items
@@ -527,12 +786,43 @@ class PolygonClient:
         if not bars_start or not bars_end:
             bars_start, bars_end = _default_range(bars_timespan, bars_lookback)
 
-        # quote
-        q = await self.prev_close(symbol)
+        sym = symbol.upper()  # normalised once and passed to every leg
+        # quote, bars, news and events have no data dependency -> fetch concurrently
+        news_coro = (
+            self.news(sym, limit=news_limit) if news_limit and news_limit > 0 else _empty_list()
+        )
+        # events_limit=0: callers that only want quote/bars skip three provider hops
+        if events_limit and events_limit > 0:
+            events_coros = (
+                self.events.dividends(sym, limit=events_limit),
+                self.events.splits(sym, limit=events_limit),
+                self.events.earnings(sym, limit=events_limit),
+            )
+        else:
+            events_coros = (_empty_list(), _empty_list(), _empty_list())
+        q, bars, latest_news, dividends, splits, earnings = await asyncio.gather(
+            self.prev_close(sym),
+            self.aggregates(sym, bars_multiplier, bars_timespan, bars_start, bars_end),
+            news_coro,
+            *events_coros,
+            return_exceptions=True,
+        )
+        # quote + bars are required; news/events degrade to empty on failure
+        for res in (q, bars):
+            if isinstance(res, BaseException):
+                raise res
+        legs = (("news", latest_news), ("dividends", dividends), ("splits", splits), ("earnings", earnings))
+        for leg, res in legs:
+            if isinstance(res, BaseException):
+                print(f"[stock] {sym}: {leg} unavailable ({type(res).__name__}: {res})")
+        latest_news, dividends, splits, earnings = (
+            [] if isinstance(res, BaseException) else res for _, res in legs
+        )
+
         ts = q.get("t")
         as_of_dt = _epoch_ms_to_utc(ts) or datetime.now(timezone.utc)
         quote = Quote(
-            symbol=symbol.upper(),
+            symbol=sym,
             prevClose=q.get("c"),
             high=q.get("h"),
             low=q.get("l"),
@@ -540,27 +830,8 @@ class PolygonClient:
             as_of=as_of_dt,
         )
 
-        # bars
-        bars_raw = await self.aggregates(
-            symbol, bars_multiplier, bars_timespan, bars_start, bars_end
-        )
-        bars = [Bar(t=b["t"], o=b["o"], h=b["h"], l=b["l"], c=b["c"], v=b["v"]) for b in bars_raw]
-
-        # news
-        if news_limit and news_limit > 0:
-            latest_news = await self.news(symbol, limit=news_limit)
-        else:
-            latest_news = []
-
-        # events (via EventsPort)
-        dividends, splits, earnings = await asyncio.gather(
-            self.events.dividends(symbol, limit=events_limit),
-            self.events.splits(symbol, limit=events_limit),
-            self.events.earnings(symbol, limit=events_limit),
-        )
-
         return IntelBundle(
-            symbol=symbol.upper(),
+            symbol=sym,
             quote=quote,
             bars=bars,
             news=latest_news,
@@ -569,6 +840,20 @@ class PolygonClient:
             earnings=earnings,
         )
 
+    async def bundle_many(self, symbols: List[str], *, concurrency: int = 8, **kw) -> List[IntelBundle]:
+        """
+        bundle() for a watchlist: Polygon has no server-side batching, so run the
+        per-symbol bundles concurrently, at most `concurrency` at a time (the shared
+        token bucket still paces the individual requests). Results follow `symbols`.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(sym: str) -> IntelBundle:
+            async with sem:
+                return await self.bundle(sym, **kw)
+
+        return await asyncio.gather(*(_one(s) for s in symbols))
+
     # ---------- options convenience ----------
 
     async def option_expirations(self, symbol: str) -> List[datetime]:
@@ -612,7 +897,7 @@ async def _smoke():
         else:
             print("No option expirations found.")
     finally:
-        await cli.aclose()
+        await aclose_all()
 
 if __name__ == "__main__":
     asyncio.run(_smoke())